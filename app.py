@@ -1,7 +1,7 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
+from fastapi.responses import FileResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import sqlite3
@@ -9,24 +9,51 @@ import os
 import uuid
 import json
 import requests
-from datetime import datetime
+from datetime import datetime, timedelta
 import shutil
+import mimetypes
 from pathlib import Path
 import csv
 import random # For picking random examples
+import time
+import threading
+import hashlib
+import struct
+import re
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
 # Structured Data Processing
-import pandas as pd
-import openpyxl
+# pandas/openpyxl diimpor saat pertama kali dipakai (lihat _pandas()) agar startup worker cepat
+from archive_store import ArchiveStore
+from static_assets import COMPRESSED_VARIANTS, FRONTEND_DIR, STATIC_DIST_DIR, build_static_assets
 
 # Constants
 STRUCTURED_DATA_UPLOAD_DIR = "excel_uploads"
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+# Riwayat chat lama dipindahkan ke database arsip bulanan di direktori ini
+CHAT_ARCHIVE_DIR = os.getenv("CHAT_ARCHIVE_DIR", "chat_archive")
+CHAT_HISTORY_BATCH_SIZE = 5000 # baris per transaksi saat mengarsipkan/menghapus riwayat chat
+# Jumlah sheet hasil parse (DataFrame) yang disimpan di memori
+STRUCTURED_SHEET_CACHE_SIZE = int(os.getenv("STRUCTURED_SHEET_CACHE_SIZE", "16"))
+# Snapshot biner data arsip + indeks pencarian; dibangun ulang hanya jika CSV berubah, lalu di-mmap
+# sehingga bisa dipakai bersama oleh beberapa worker. Kosongkan untuk menonaktifkan; tanpa snapshot
+# arsip disimpan di memori tiap worker dan memakai ~14% lebih banyak memori daripada list[str]
+# (teks asli + salinan lowercase untuk pencarian).
+ARCHIVE_SNAPSHOT_PATH = os.getenv("ARCHIVE_SNAPSHOT_PATH", "archive_snapshot.bin")
+# Cache jawaban Groq dan batas request bersamaan (dipakai /chat dan /chat/batch)
+GROQ_CACHE_SIZE = int(os.getenv("GROQ_CACHE_SIZE", "512"))
+GROQ_MAX_CONCURRENT_REQUESTS = int(os.getenv("GROQ_MAX_CONCURRENT_REQUESTS", "4"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "3"))
+BATCH_DEFAULT_PARALLELISM = 4
+BATCH_MAX_PARALLELISM = 16
 
 # Ensure upload directory exists
 Path(STRUCTURED_DATA_UPLOAD_DIR).mkdir(exist_ok=True)
@@ -37,11 +64,23 @@ if not GROQ_API_KEY:
     print("   Please create a .env file with your GROQ API key")
     print("   Get your free API key at: https://console.groq.com/")
 
+# --- STARTUP ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the database and map the archive snapshot in every worker process."""
+    global STATIC_MANIFEST
+    initialize_db()
+    if len(ARCHIVE_DATA) == 0:
+        load_archive_data()
+    STATIC_MANIFEST = build_static_assets(FRONTEND_DIR, STATIC_DIST_DIR)
+    yield
+
 # Initialize FastAPI
 app = FastAPI(
     title="Local Structured Data Chat System",
     description="Local structured data analysis and chat system powered by Groq AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -51,8 +90,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Kompresi gzip untuk respons JSON; aset statis sudah dikompres sebelumnya (lihat static_assets.py)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Pydantic models
 class ChatMessage(BaseModel):
     message: str
@@ -64,12 +107,23 @@ class ChatResponse(BaseModel):
     source_document_name: Optional[str] = None
     next_action: str = "continue_chat" # 'continue_chat', 'await_selection'
 
+class StructuredSheetColumn(BaseModel):
+    name: str
+    dtype: str
+
+class StructuredSheet(BaseModel):
+    sheet_name: str
+    sheet_index: int
+    row_count: int
+    columns: List[StructuredSheetColumn]
+
 class StructuredDocument(BaseModel):
     id: str
     filename: str
     upload_date: str
     data_preview: Optional[List[Dict[str, Any]]] = None
     row_count: int
+    sheets: Optional[List[StructuredSheet]] = None
 
 class SystemStats(BaseModel):
     total_structured_documents: int
@@ -88,6 +142,48 @@ def get_db_connection():
     conn.row_factory = sqlite3.Row
     return conn
 
+# --- Indeks full-text (FTS5) untuk chat_history ---
+CHAT_HISTORY_FTS_AVAILABLE = True # False jika SQLite dikompilasi tanpa FTS5 (pencarian memakai LIKE)
+
+def _ensure_chat_history_fts(conn) -> bool:
+    """
+    Create the external-content FTS5 index over chat_history(message, response) plus the
+    triggers that keep it in sync; a newly created index is backfilled. Returns False without FTS5.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'chat_history_fts'"
+    ).fetchone()
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS chat_history_fts USING fts5(
+                message, response,
+                content='chat_history', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"[WARN] FTS5 tidak tersedia, pencarian riwayat chat memakai LIKE: {e}")
+        return False
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS chat_history_fts_ai AFTER INSERT ON chat_history BEGIN
+            INSERT INTO chat_history_fts(rowid, message, response) VALUES (new.id, new.message, new.response);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS chat_history_fts_ad AFTER DELETE ON chat_history BEGIN
+            INSERT INTO chat_history_fts(chat_history_fts, rowid, message, response) VALUES ('delete', old.id, old.message, old.response);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS chat_history_fts_au AFTER UPDATE ON chat_history BEGIN
+            INSERT INTO chat_history_fts(chat_history_fts, rowid, message, response) VALUES ('delete', old.id, old.message, old.response);
+            INSERT INTO chat_history_fts(rowid, message, response) VALUES (new.id, new.message, new.response);
+        END
+    """)
+    if not exists:
+        conn.execute("INSERT INTO chat_history_fts(chat_history_fts) VALUES ('rebuild')")
+    return True
+
 # Database Initialization
 def initialize_db():
     conn = get_db_connection()
@@ -115,66 +211,560 @@ def initialize_db():
         )
     """)
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_chat_history_timestamp ON chat_history(timestamp)')
+    global CHAT_HISTORY_FTS_AVAILABLE
+    CHAT_HISTORY_FTS_AVAILABLE = _ensure_chat_history_fts(conn)
+    # Katalog sheet (beserta skema kolom) untuk setiap dokumen di excel_documents
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS excel_sheets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            document_id TEXT NOT NULL,
+            sheet_index INTEGER NOT NULL,
+            sheet_name TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            column_count INTEGER NOT NULL,
+            UNIQUE (document_id, sheet_name)
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS excel_sheet_columns (
+            sheet_id INTEGER NOT NULL,
+            column_index INTEGER NOT NULL,
+            column_name TEXT NOT NULL,
+            dtype TEXT NOT NULL,
+            PRIMARY KEY (sheet_id, column_index)
+        )
+    """)
+    # Ringkasan deep dive yang sudah dihitung untuk setiap judul arsip
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS archive_summaries (
+            title_hash TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            summary TEXT NOT NULL,
+            generated_at TEXT NOT NULL
+        )
+    """)
     conn.commit()
     conn.close()
     print("Database initialized successfully.")
 
+# --- Arsip riwayat chat (database SQLite per bulan di CHAT_ARCHIVE_DIR) ---
+CHAT_HISTORY_COLUMNS = "id, message, response, timestamp, is_predefined, excel_document_id, chat_turn"
+
+def _chat_archive_path(month: str) -> Path:
+    return Path(CHAT_ARCHIVE_DIR) / f"chat_history_{month}.db"
+
+def _chat_archive_months() -> List[str]:
+    """Archived months (YYYY-MM), newest first."""
+    archive_dir = Path(CHAT_ARCHIVE_DIR)
+    if not archive_dir.exists():
+        return []
+    return sorted((p.stem.removeprefix("chat_history_") for p in archive_dir.glob("chat_history_*.db")), reverse=True)
+
+def _initialize_chat_archive(path: Path):
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS chat_history (
+                id INTEGER PRIMARY KEY,
+                message TEXT NOT NULL,
+                response TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                is_predefined INTEGER,
+                excel_document_id TEXT,
+                chat_turn INTEGER DEFAULT 0
+            )
+        """)
+        _ensure_chat_history_fts(conn)
+        conn.commit()
+    finally:
+        conn.close()
+
+def archive_chat_history(older_than_days: int = 90, batch_size: int = CHAT_HISTORY_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Move chat_history rows older than `older_than_days` into monthly archive databases.
+    Each batch is copied and deleted in one transaction across the attached archive,
+    so an interrupted run never loses or duplicates rows. Returns rows moved per month.
+    """
+    cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+    Path(CHAT_ARCHIVE_DIR).mkdir(exist_ok=True)
+    moved = {}
+
+    conn = get_db_connection()
+    try:
+        months = [row[0] for row in conn.execute(
+            "SELECT DISTINCT substr(timestamp, 1, 7) FROM chat_history WHERE timestamp < ?", (cutoff,)
+        )]
+        for month in months:
+            archive_path = _chat_archive_path(month)
+            _initialize_chat_archive(archive_path)
+            conn.execute("ATTACH DATABASE ? AS chat_archive", (str(archive_path),))
+            try:
+                moved[month] = 0
+                while True:
+                    ids = [row[0] for row in conn.execute(
+                        "SELECT id FROM main.chat_history WHERE timestamp < ? AND substr(timestamp, 1, 7) = ? ORDER BY id LIMIT ?",
+                        (cutoff, month, batch_size)
+                    )]
+                    if not ids:
+                        break
+                    placeholders = ",".join("?" * len(ids))
+                    conn.execute(
+                        # INSERT biasa: REPLACE pada tabel FTS external-content tidak memicu trigger _ad
+                        # sehingga token lama tertinggal di indeks. Id unik dan dipindah dalam satu transaksi.
+                        f"INSERT INTO chat_archive.chat_history ({CHAT_HISTORY_COLUMNS}) "
+                        f"SELECT {CHAT_HISTORY_COLUMNS} FROM main.chat_history WHERE id IN ({placeholders})",
+                        ids
+                    )
+                    conn.execute(f"DELETE FROM main.chat_history WHERE id IN ({placeholders})", ids)
+                    conn.commit()
+                    moved[month] += len(ids)
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.execute("DETACH DATABASE chat_archive")
+    finally:
+        conn.close()
+    return moved
+
+def _fts_match_query(query: str) -> str:
+    """Turn free text into an FTS5 query: every word must appear (quoted, so no FTS syntax leaks)."""
+    return " ".join('"' + token.replace('"', '""') + '"' for token in query.split())
+
+def _search_chat_history_db(conn, query: str, limit: int, use_fts: bool) -> List[Dict[str, Any]]:
+    if use_fts:
+        rows = conn.execute(
+            f"""
+            SELECT {", ".join("h." + c.strip() for c in CHAT_HISTORY_COLUMNS.split(","))},
+                   snippet(chat_history_fts, -1, '[', ']', '…', 12) AS snippet
+            FROM chat_history_fts
+            JOIN chat_history h ON h.id = chat_history_fts.rowid
+            WHERE chat_history_fts MATCH ?
+            ORDER BY bm25(chat_history_fts)
+            LIMIT ?
+            """,
+            (_fts_match_query(query), limit)
+        ).fetchall()
+    else:
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%"
+        rows = conn.execute(
+            f"""
+            SELECT {CHAT_HISTORY_COLUMNS}, NULL AS snippet FROM chat_history
+            WHERE message LIKE ? ESCAPE '\\' OR response LIKE ? ESCAPE '\\'
+            ORDER BY timestamp DESC
+            LIMIT ?
+            """,
+            (pattern, pattern, limit)
+        ).fetchall()
+    return [dict(row) for row in rows]
+
 # --- GLOBAL VARIABLES for archive data and conversation state ---
-ARCHIVE_DATA = [] # Akan menyimpan data dari Data_Full_Name.csv
+STATIC_MANIFEST = {} # Nama aset publik -> file hasil build di static_dist (lihat static_assets.py)
+ARCHIVE_DATA = ArchiveStore.from_entries([]) # Akan menyimpan data dari Data_Full_Name.csv (lihat archive_store.py)
 # Menyimpan konteks percakapan untuk 'deep dive'
 # Contoh: {'last_search_results': [...], 'state': 'initial_search'/'awaiting_selection'/'deep_diving'}
 conversation_context = {} 
+conversation_context_lock = threading.Lock()
+
+# --- Snapshot biner data arsip ---
+def _file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _write_archive_snapshot_meta(csv_file_path: str, snapshot_path: str, csv_sha256: str):
+    stat = os.stat(csv_file_path)
+    meta = {
+        "csv_path": os.path.abspath(csv_file_path),
+        "csv_size": stat.st_size,
+        "csv_mtime_ns": stat.st_mtime_ns,
+        "csv_sha256": csv_sha256,
+    }
+    tmp_path = f"{snapshot_path}.json.tmp{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, f"{snapshot_path}.json")
+
+def _archive_snapshot_is_fresh(csv_file_path: str, snapshot_path: str) -> bool:
+    """A snapshot is fresh if it was built from this CSV and the CSV content has not changed."""
+    try:
+        with open(f"{snapshot_path}.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        stat = os.stat(csv_file_path)
+    except (OSError, ValueError):
+        return False
+    if not os.path.exists(snapshot_path) or meta.get("csv_path") != os.path.abspath(csv_file_path):
+        return False
+    if meta.get("csv_size") == stat.st_size and meta.get("csv_mtime_ns") == stat.st_mtime_ns:
+        return True
+    # mtime berubah (mis. file disalin ulang): cek isi sebelum membangun ulang
+    csv_sha256 = _file_sha256(csv_file_path)
+    if meta.get("csv_sha256") != csv_sha256:
+        return False
+    _write_archive_snapshot_meta(csv_file_path, snapshot_path, csv_sha256)
+    return True
 
 # --- Fungsi untuk memuat data arsip dari Data_Full_Name.csv ---
 def load_archive_data(csv_file_path="Data_Full_Name.csv"):
     global ARCHIVE_DATA
+    if ARCHIVE_SNAPSHOT_PATH:
+        try:
+            if _archive_snapshot_is_fresh(csv_file_path, ARCHIVE_SNAPSHOT_PATH):
+                ARCHIVE_DATA = ArchiveStore.open_mmap(ARCHIVE_SNAPSHOT_PATH)
+                print(f"[INFO] Data arsip dimuat dari snapshot {ARCHIVE_SNAPSHOT_PATH}. Jumlah entri: {len(ARCHIVE_DATA)}")
+                return
+        except (OSError, ValueError, struct.error) as e:
+            print(f"[WARN] Snapshot arsip tidak dapat dibaca, membangun ulang dari CSV: {e}")
+
     try:
         # Membaca CSV tanpa header, setiap baris adalah satu entri
         with open(csv_file_path, 'r', encoding='utf-8') as f:
             reader = csv.reader(f)
-            ARCHIVE_DATA = [row[0].strip() for row in reader if row and row[0].strip()] 
-        print(f"[INFO] Data arsip berhasil dimuat dari {csv_file_path}. Jumlah entri: {len(ARCHIVE_DATA)}")
+            store = ArchiveStore.from_entries(row[0].strip() for row in reader if row and row[0].strip())
     except FileNotFoundError:
         print(f"[ERROR] File CSV '{csv_file_path}' tidak ditemukan. Fitur pencarian awal mungkin tidak berfungsi.")
-        ARCHIVE_DATA = [] 
+        ARCHIVE_DATA = ArchiveStore.from_entries([])
+        return
     except Exception as e:
         print(f"[ERROR] Terjadi kesalahan saat memuat CSV '{csv_file_path}': {e}")
-        ARCHIVE_DATA = []
+        ARCHIVE_DATA = ArchiveStore.from_entries([])
+        return
+
+    if ARCHIVE_SNAPSHOT_PATH:
+        # Gagal menulis snapshot (direktori tidak ada, read-only, file sedang di-mmap worker lain)
+        # tidak boleh mengosongkan arsip: tetap pakai data yang sudah dimuat di memori
+        try:
+            store.save(ARCHIVE_SNAPSHOT_PATH)
+            _write_archive_snapshot_meta(csv_file_path, ARCHIVE_SNAPSHOT_PATH, _file_sha256(csv_file_path))
+            store = ArchiveStore.open_mmap(ARCHIVE_SNAPSHOT_PATH)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"[WARN] Snapshot arsip tidak dapat ditulis, memakai data arsip di memori: {e}")
+    ARCHIVE_DATA = store
+    print(f"[INFO] Data arsip berhasil dimuat dari {csv_file_path}. Jumlah entri: {len(ARCHIVE_DATA)}")
 
 # --- Fungsi untuk melakukan pencarian di ARCHIVE_DATA (Data_Full_Name.csv) ---
-def search_initial_archive_list(query: str) -> List[str]:
-    query_lower = query.lower()
-    results = [entry for entry in ARCHIVE_DATA if query_lower in entry.lower()]
-    return results
+def search_initial_archive_list(query: str, limit: Optional[int] = None) -> List[str]:
+    return ARCHIVE_DATA.search(query, limit=limit)
 
-# Function to extract data from Excel or CSV (for uploaded files, unchanged)
-def extract_data_from_structured_file(file_path: Path):
+# --- Ringkasan deep dive arsip (tabel archive_summaries) ---
+def normalize_archive_title(title: str) -> str:
+    return re.sub(r"\s+", " ", title).strip().lower()
+
+def archive_title_hash(title: str) -> str:
+    return hashlib.sha1(normalize_archive_title(title).encode("utf-8")).hexdigest()
+
+def get_archive_summary(title: str) -> Optional[str]:
+    """Return the precomputed deep-dive summary for an archive title, or None on a miss."""
+    conn = get_db_connection()
     try:
-        file_extension = file_path.suffix.lower()
-        df = None
-        if file_extension in ['.xlsx', '.xls']:
-            df = pd.read_excel(file_path)
-        elif file_extension == '.csv':
-            df = pd.read_csv(file_path)
-        else:
-            raise ValueError("Unsupported file type for structured data extraction.")
+        row = conn.execute(
+            "SELECT summary FROM archive_summaries WHERE title_hash = ?",
+            (archive_title_hash(title),)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        row = None  # tabel belum dibuat (initialize_db belum dijalankan)
+    finally:
+        conn.close()
+    return row["summary"] if row else None
 
-        num_rows_for_ai = min(len(df), 50)
-        num_cols_for_ai = min(len(df.columns), 10)
+def store_archive_summaries(summaries: List[tuple]):
+    """Insert or replace (title, summary) pairs in archive_summaries."""
+    if not summaries:
+        return
+    generated_at = datetime.now().isoformat()
+    conn = get_db_connection()
+    try:
+        conn.executemany(
+            "INSERT OR REPLACE INTO archive_summaries (title_hash, title, summary, generated_at) VALUES (?, ?, ?, ?)",
+            [(archive_title_hash(title), title, summary, generated_at) for title, summary in summaries]
+        )
+        conn.commit()
+    finally:
+        conn.close()
 
-        data_string = df.head(num_rows_for_ai).iloc[:, :num_cols_for_ai].to_string()
-        return data_string, len(df)
-    except Exception as e:
-        print(f"Error extracting data from structured file {file_path}: {e}")
-        return None, 0
+def precompute_archive_summaries(parallelism: int = BATCH_DEFAULT_PARALLELISM, refresh_all: bool = False,
+                                 prune: bool = True, commit_every: int = 20) -> Dict[str, int]:
+    """
+    Generate deep-dive summaries for ARCHIVE_DATA entries through the batch runner.
+    Only titles without a stored summary are generated unless refresh_all is set;
+    with prune, summaries for titles no longer in the CSV are removed.
+    """
+    titles_by_hash = {}
+    for entry in ARCHIVE_DATA:
+        titles_by_hash.setdefault(archive_title_hash(entry), entry)
+
+    conn = get_db_connection()
+    existing_hashes = {row["title_hash"] for row in conn.execute("SELECT title_hash FROM archive_summaries")}
+    removed = 0
+    if prune:
+        stale_hashes = [(h,) for h in existing_hashes - titles_by_hash.keys()]
+        conn.executemany("DELETE FROM archive_summaries WHERE title_hash = ?", stale_hashes)
+        conn.commit()
+        removed = len(stale_hashes)
+    conn.close()
+
+    items = [
+        {"id": title_hash, "archive_title": title}
+        for title_hash, title in titles_by_hash.items()
+        if refresh_all or title_hash not in existing_hashes
+    ]
+
+    generated = 0
+    failed = 0
+    pending = []
+    for result in run_chat_batch(items, parallelism=parallelism):
+        if result["status"] != "ok":
+            failed += 1
+            print(f"[WARN] Gagal membuat ringkasan untuk '{titles_by_hash[result['id']]}': {result['response']}")
+            continue
+        pending.append((titles_by_hash[result["id"]], result["response"]))
+        generated += 1
+        if len(pending) >= commit_every:
+            store_archive_summaries(pending)
+            pending = []
+    store_archive_summaries(pending)
+
+    return {
+        "total_titles": len(titles_by_hash),
+        "generated": generated,
+        "failed": failed,
+        "skipped": len(titles_by_hash) - len(items),
+        "removed": removed,
+    }
+
+def _pandas():
+    """Import pandas on first use; it is the slowest import in the app."""
+    import pandas as pd
+    return pd
+
+def _openpyxl():
+    import openpyxl
+    return openpyxl
+
+# --- Membaca sheet dari file data terstruktur ---
+def _sheet_column_names(header_row) -> List[str]:
+    """Column names as pandas would produce them: 'Unnamed: i' for blanks, '.n' suffix for duplicates."""
+    names = []
+    seen = {}
+    for i, value in enumerate(header_row):
+        name = str(value) if value is not None else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def _dataframe_from_openpyxl_sheet(worksheet):
+    pd = _pandas()
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return pd.DataFrame()
+    columns = _sheet_column_names(header)
+    width = len(columns)
+    df = pd.DataFrame.from_records([row[:width] for row in rows], columns=columns)
+    return df.dropna(how="all")
+
+def _apply_sheet_dtypes(df, dtypes: Dict[str, str]):
+    for column, dtype in dtypes.items():
+        if column in df.columns and dtype != "object" and str(df[column].dtype) != dtype:
+            try:
+                df[column] = df[column].astype(dtype)
+            except (ValueError, TypeError):
+                pass  # biarkan tipe hasil inferensi jika konversi gagal
+    return df
+
+def _read_structured_sheets(file_path: Path):
+    """Yield (sheet_index, sheet_name, DataFrame) for every sheet; a CSV is a single sheet."""
+    pd = _pandas()
+    file_extension = file_path.suffix.lower()
+    if file_extension == '.xlsx':
+        workbook = _openpyxl().load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            for sheet_index, worksheet in enumerate(workbook.worksheets):
+                yield sheet_index, worksheet.title, _dataframe_from_openpyxl_sheet(worksheet)
+        finally:
+            workbook.close()
+    elif file_extension == '.xls':
+        for sheet_index, (sheet_name, df) in enumerate(pd.read_excel(file_path, sheet_name=None).items()):
+            yield sheet_index, str(sheet_name), df
+    elif file_extension == '.csv':
+        yield 0, "csv", pd.read_csv(file_path)
+    else:
+        raise ValueError("Unsupported file type for structured data extraction.")
+
+def _read_structured_sheet(file_path: Path, sheet_name: str, dtypes: Dict[str, str]):
+    """Read a single sheet, applying the column types recorded in the catalog."""
+    pd = _pandas()
+    file_extension = file_path.suffix.lower()
+    if file_extension == '.xlsx':
+        workbook = _openpyxl().load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            df = _dataframe_from_openpyxl_sheet(workbook[sheet_name])
+        finally:
+            workbook.close()
+    elif file_extension == '.xls':
+        df = pd.read_excel(file_path, sheet_name=sheet_name)
+    elif file_extension == '.csv':
+        date_columns = [c for c, d in dtypes.items() if d.startswith("datetime64")]
+        typed_columns = {c: d for c, d in dtypes.items() if c not in date_columns and d != "object"}
+        try:
+            return pd.read_csv(file_path, dtype=typed_columns, parse_dates=date_columns)
+        except (ValueError, TypeError):
+            df = pd.read_csv(file_path)
+    else:
+        raise ValueError("Unsupported file type for structured data extraction.")
+    return _apply_sheet_dtypes(df, dtypes)
+
+# --- Cache LRU per sheet: (doc_id, sheet_name) -> DataFrame ---
+_structured_sheet_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+_structured_sheet_cache_lock = threading.Lock()
+
+def _get_cached_sheet(cache_key: tuple):
+    with _structured_sheet_cache_lock:
+        df = _structured_sheet_cache.get(cache_key)
+        if df is not None:
+            _structured_sheet_cache.move_to_end(cache_key)
+        return df
+
+def _store_cached_sheet(cache_key: tuple, df):
+    if STRUCTURED_SHEET_CACHE_SIZE <= 0:
+        return
+    with _structured_sheet_cache_lock:
+        _structured_sheet_cache[cache_key] = df
+        _structured_sheet_cache.move_to_end(cache_key)
+        while len(_structured_sheet_cache) > STRUCTURED_SHEET_CACHE_SIZE:
+            _structured_sheet_cache.popitem(last=False)
+
+def clear_structured_sheet_cache(doc_id: Optional[str] = None):
+    with _structured_sheet_cache_lock:
+        if doc_id is None:
+            _structured_sheet_cache.clear()
+            return
+        for cache_key in [key for key in _structured_sheet_cache if key[0] == doc_id]:
+            del _structured_sheet_cache[cache_key]
+
+# --- Katalog sheet (tabel excel_sheets & excel_sheet_columns) ---
+def catalog_structured_document(doc_id: str, file_path: Path, conn) -> tuple:
+    """
+    Parse every sheet once and record only its schema in the catalog tables; sheets are
+    cached later, when a query loads them. Returns (sheets, first_sheet_preview). The caller commits.
+    """
+    sheets = []
+    first_preview = None
+    conn.execute(
+        "DELETE FROM excel_sheet_columns WHERE sheet_id IN (SELECT id FROM excel_sheets WHERE document_id = ?)",
+        (doc_id,)
+    )
+    conn.execute("DELETE FROM excel_sheets WHERE document_id = ?", (doc_id,))
+    for sheet_index, sheet_name, df in _read_structured_sheets(file_path):
+        columns = [StructuredSheetColumn(name=str(c), dtype=str(df[c].dtype)) for c in df.columns]
+        cursor = conn.execute(
+            "INSERT INTO excel_sheets (document_id, sheet_index, sheet_name, row_count, column_count) VALUES (?, ?, ?, ?, ?)",
+            (doc_id, sheet_index, sheet_name, len(df), len(columns))
+        )
+        conn.executemany(
+            "INSERT INTO excel_sheet_columns (sheet_id, column_index, column_name, dtype) VALUES (?, ?, ?, ?)",
+            [(cursor.lastrowid, i, col.name, col.dtype) for i, col in enumerate(columns)]
+        )
+        sheets.append(StructuredSheet(sheet_name=sheet_name, sheet_index=sheet_index, row_count=len(df), columns=columns))
+        if first_preview is None:
+            first_preview = df.head(5).copy()  # salinan, agar DataFrame penuh bisa dibebaskan
+    return sheets, first_preview
+
+def get_structured_sheets(doc_id: str, conn) -> List[StructuredSheet]:
+    rows = conn.execute(
+        """
+        SELECT s.sheet_name, s.sheet_index, s.row_count, c.column_name, c.dtype
+        FROM excel_sheets s
+        LEFT JOIN excel_sheet_columns c ON c.sheet_id = s.id
+        WHERE s.document_id = ?
+        ORDER BY s.sheet_index, c.column_index
+        """,
+        (doc_id,)
+    ).fetchall()
+    sheets = OrderedDict()
+    for row in rows:
+        sheet = sheets.get(row["sheet_name"])
+        if sheet is None:
+            sheet = sheets[row["sheet_name"]] = StructuredSheet(
+                sheet_name=row["sheet_name"], sheet_index=row["sheet_index"], row_count=row["row_count"], columns=[]
+            )
+        if row["column_name"] is not None:
+            sheet.columns.append(StructuredSheetColumn(name=row["column_name"], dtype=row["dtype"]))
+    return list(sheets.values())
+
+def _sheet_search_text(df):
+    """Lowercased text of every row (cells joined by \\x00), built once so queries don't convert the whole sheet."""
+    text = df.astype(str)
+    if text.shape[1] == 0:
+        return _pandas().Series("", index=text.index, dtype=object)
+    # map(str): astype(str) bisa membiarkan NaN, sedangkan pencarian mencocokkan str(cell) ('nan')
+    columns = [text.iloc[:, i].map(str) for i in range(text.shape[1])]
+    return columns[0].str.cat(columns[1:], sep="\x00").str.lower()
+
+def _load_cached_sheet(doc_id: str, file_path: Path, sheet: StructuredSheet) -> tuple:
+    """Return (DataFrame, row search text) for one sheet, parsing only that sheet on a cache miss."""
+    cache_key = (doc_id, sheet.sheet_name)
+    entry = _get_cached_sheet(cache_key)
+    if entry is None:
+        dtypes = {col.name: col.dtype for col in sheet.columns}
+        df = _read_structured_sheet(file_path, sheet.sheet_name, dtypes)
+        entry = (df, _sheet_search_text(df))
+        _store_cached_sheet(cache_key, entry)
+    return entry
+
+def load_structured_sheet(doc_id: str, file_path: Path, sheet: StructuredSheet):
+    """Return the DataFrame for one sheet, parsing only that sheet on a cache miss."""
+    return _load_cached_sheet(doc_id, file_path, sheet)[0]
+
+# Cache LRU untuk jawaban Groq dan semaphore pembatas request bersamaan
+_groq_response_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_groq_cache_lock = threading.Lock()
+_groq_request_slots = threading.BoundedSemaphore(max(1, GROQ_MAX_CONCURRENT_REQUESTS))
+
+def _get_cached_groq_response(cache_key: tuple) -> Optional[str]:
+    with _groq_cache_lock:
+        cached = _groq_response_cache.get(cache_key)
+        if cached is not None:
+            _groq_response_cache.move_to_end(cache_key)
+        return cached
+
+def _store_cached_groq_response(cache_key: tuple, content: str):
+    if GROQ_CACHE_SIZE <= 0:
+        return
+    with _groq_cache_lock:
+        _groq_response_cache[cache_key] = content
+        _groq_response_cache.move_to_end(cache_key)
+        while len(_groq_response_cache) > GROQ_CACHE_SIZE:
+            _groq_response_cache.popitem(last=False)
+
+def _retry_after_seconds(response, attempt: int) -> float:
+    retry_after = response.headers.get("retry-after")
+    try:
+        return min(float(retry_after), 30.0)
+    except (TypeError, ValueError):
+        return min(2 ** attempt, 30)
 
 def query_groq(prompt: str, max_tokens: int = 2000, model: str = "llama3-8b-8192") -> str:
     """
-    Query GROQ API for AI responses
+    Query GROQ API for AI responses.
+    Successful responses are cached (LRU) and concurrent requests are limited
+    by GROQ_MAX_CONCURRENT_REQUESTS; HTTP 429 is retried with backoff.
     """
     if not GROQ_API_KEY:
         return "Error: GROQ API key not configured. Please check your .env file."
 
+    cache_key = (model, max_tokens, prompt)
+    cached = _get_cached_groq_response(cache_key)
+    if cached is not None:
+        return cached
+
     try:
         headers = {
             "Authorization": f"Bearer {GROQ_API_KEY}",
@@ -199,12 +789,20 @@ def query_groq(prompt: str, max_tokens: int = 2000, model: str = "llama3-8b-8192
             "stream": False
         }
 
-        response = requests.post(GROQ_API_URL, json=payload, headers=headers, timeout=30)
+        for attempt in range(GROQ_MAX_RETRIES + 1):
+            with _groq_request_slots:
+                response = requests.post(GROQ_API_URL, json=payload, headers=headers, timeout=30)
+            if response.status_code == 429 and attempt < GROQ_MAX_RETRIES:
+                time.sleep(_retry_after_seconds(response, attempt))
+                continue
+            break
 
         if response.status_code == 200:
             result = response.json()
             if "choices" in result and len(result["choices"]) > 0:
-                return result["choices"][0]["message"]["content"]
+                content = result["choices"][0]["message"]["content"]
+                _store_cached_groq_response(cache_key, content)
+                return content
             else:
                 return "Error: Invalid response format from GROQ API"
         elif response.status_code == 401:
@@ -223,43 +821,166 @@ def query_groq(prompt: str, max_tokens: int = 2000, model: str = "llama3-8b-8192
         print(f"Error querying GROQ: {e}")
         return f"Error: {str(e)}"
 
-# Function for searching structured data (Excel or CSV that were UPLOADED, unchanged logic)
-def search_structured_data(doc_id: str, query: str) -> tuple[str, list]:
+# --- Prompt deep dive untuk satu judul arsip (dipakai /chat dan batch) ---
+def build_deep_dive_prompt(selected_item: str) -> str:
+    return f"""
+                Pengguna telah memilih arsip berjudul: "{selected_item}".
+                Sebagai asisten cerdas yang fokus pada arsip, jelaskan lebih detail tentang arsip ini. 
+                Sertakan konteks umum mengenai jenis arsip seperti ini (misalnya, jika 'Inventaris Arsip', jelaskan apa itu inventaris arsip dan apa yang mungkin terkandung di dalamnya). 
+                Jelaskan dengan jelas dan informatif.
+                """
+
+# --- Batch: menjawab pertanyaan tanpa menyentuh conversation_context global ---
+def answer_batch_question(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Answer one batch item. Items with 'archive_title' get a deep-dive description,
+    otherwise 'message' is answered using matching archive entries as context.
+    """
+    item_id = item.get("id")
+    archive_title = (item.get("archive_title") or "").strip()
+    user_message = (item.get("message") or "").strip()
+
+    if archive_title:
+        prompt = build_deep_dive_prompt(archive_title)
+        max_tokens = 1000
+    elif user_message:
+        matches = search_initial_archive_list(user_message, limit=10)
+        context_lines = "\n".join(f"- {entry}" for entry in matches) or "- (tidak ada arsip yang cocok)"
+        prompt = f"""
+        Daftar arsip yang relevan dengan pertanyaan pengguna:
+        {context_lines}
+
+        Pertanyaan Pengguna: "{user_message}"
+        Jawablah berdasarkan daftar arsip di atas jika relevan.
+        """
+        max_tokens = 500
+    else:
+        return {"id": item_id, "status": "error", "response": "Item harus berisi 'message' atau 'archive_title'."}
+
+    response_text = query_groq(prompt, max_tokens=max_tokens)
+    status = "error" if response_text.startswith("Error:") else "ok"
+    return {"id": item_id, "status": status, "response": response_text}
+
+def parse_batch_lines(lines) -> List[Dict[str, Any]]:
+    """Parse JSONL lines into batch items; items without an 'id' get their line number."""
+    items = []
+    for line_number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Baris {line_number} bukan JSON yang valid: {e}")
+        if isinstance(item, str):
+            item = {"message": item}
+        if not isinstance(item, dict):
+            raise ValueError(f"Baris {line_number} harus berupa objek JSON.")
+        item.setdefault("id", str(line_number))
+        item["id"] = str(item["id"])
+        items.append(item)
+    return items
+
+def completed_batch_ids(lines) -> set:
+    """Collect ids that already have a successful result (for resuming a run)."""
+    done = set()
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        try:
+            result = json.loads(line)
+        except (json.JSONDecodeError, TypeError):
+            continue  # baris terakhir bisa terpotong saat run terhenti
+        if isinstance(result, dict) and result.get("status") == "ok" and result.get("id") is not None:
+            done.add(str(result["id"]))
+    return done
+
+def run_chat_batch(items: List[Dict[str, Any]], parallelism: int = BATCH_DEFAULT_PARALLELISM, skip_ids: Optional[set] = None):
+    """
+    Yield batch results as they complete, running at most `parallelism` items at once.
+    Items are submitted only as workers free up, so a consumer that stops early
+    (e.g. a disconnected /chat/batch client) does not keep spending Groq quota.
+    """
+    skip_ids = skip_ids or set()
+    pending = iter([item for item in items if item["id"] not in skip_ids])
+    parallelism = max(1, min(parallelism, BATCH_MAX_PARALLELISM))
+    executor = ThreadPoolExecutor(max_workers=parallelism)
+    futures = {}
+    try:
+        for item in islice(pending, parallelism):
+            futures[executor.submit(answer_batch_question, item)] = item
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = futures.pop(future)
+                next_item = next(pending, None)
+                if next_item is not None:
+                    futures[executor.submit(answer_batch_question, next_item)] = next_item
+                try:
+                    yield future.result()
+                except Exception as e:
+                    print(f"Error answering batch item {item['id']}: {e}")
+                    yield {"id": item["id"], "status": "error", "response": f"Error: {str(e)}"}
+    finally:
+        # Saat generator ditutup lebih awal, batalkan yang belum jalan dan jangan tunggu yang sedang jalan
+        executor.shutdown(wait=False, cancel_futures=True)
+
+# Function for searching structured data (Excel or CSV that were UPLOADED)
+def search_structured_data(doc_id: str, query: str, sheet_name: Optional[str] = None) -> tuple[str, list]:
+    """
+    Search one sheet (sheet_name) or the sheets in workbook order until 5 matching rows are found.
+    Sheets are parsed individually and cached.
+    """
     conn = get_db_connection()
     doc = conn.execute(
         "SELECT file_path FROM excel_documents WHERE id = ?",
         (doc_id,)
     ).fetchone()
-    conn.close()
-
     if not doc:
+        conn.close()
         return "Dokumen data terstruktur tidak ditemukan.", []
 
     file_path = Path(doc["file_path"])
     try:
-        df = None
-        if file_path.suffix.lower() in ['.xlsx', '.xls']:
-            df = pd.read_excel(file_path)
-        elif file_path.suffix.lower() == '.csv':
-            df = pd.read_csv(file_path)
-        else:
-            return "Tipe file data terstruktur tidak didukung untuk pencarian.", []
+        sheets = get_structured_sheets(doc_id, conn)
+        if not sheets:
+            # Dokumen yang diunggah sebelum katalog sheet ada: katalogkan sekali sekarang
+            sheets, _ = catalog_structured_document(doc_id, file_path, conn)
+            conn.commit()
+    except ValueError:
+        return "Tipe file data terstruktur tidak didukung untuk pencarian.", []
+    except Exception as e:
+        print(f"Error searching structured data: {e}")
+        return f"Gagal mencari di dokumen data terstruktur: {str(e)}", []
+    finally:
+        conn.close()
 
-        df_str = df.astype(str)
+    if sheet_name is not None:
+        sheets = [sheet for sheet in sheets if sheet.sheet_name == sheet_name]
+        if not sheets:
+            return f"Sheet '{sheet_name}' tidak ditemukan di dokumen terstruktur.", []
 
+    try:
         results = []
+        result_sheets = []
         query_lower = query.lower()
 
-        for index, row in df_str.iterrows():
-            if any(query_lower in str(cell).lower() for cell in row):
-                results.append(row.to_dict())
-                if len(results) >= 5:
-                    break
+        for sheet in sheets:
+            df, search_text = _load_cached_sheet(doc_id, file_path, sheet)
+            # Hanya baris yang cocok yang dikonversi ke teks untuk hasil
+            positions = search_text.str.contains(query_lower, regex=False).to_numpy().nonzero()[0][:5 - len(results)]
+            for row in df.iloc[positions].astype(str).to_dict(orient="records"):
+                results.append(row)
+                result_sheets.append(sheet.sheet_name)
+            if len(results) >= 5:
+                break
 
         if results:
             formatted_results = []
-            for i, res in enumerate(results):
-                formatted_results.append(f"Row {i+1}: {', '.join(f'{k}: {v}' for k, v in res.items())}")
+            for i, (res, res_sheet) in enumerate(zip(results, result_sheets)):
+                formatted_results.append(f"Row {i+1} [{res_sheet}]: {', '.join(f'{k}: {v}' for k, v in res.items())}")
             return "Ditemukan data relevan di dokumen terstruktur Anda:\n" + "\n".join(formatted_results), results
         else:
             return "Tidak ditemukan data relevan di dokumen terstruktur.", []
@@ -282,6 +1003,37 @@ def search_internet(query: str) -> tuple[str, dict]:
         print(f"Generic error during internet search: {e}")
         return f"Maaf, terjadi kesalahan tak terduga saat pencarian internet: {str(e)}", {}
 
+# --- CONDITIONAL GET (ETag / If-None-Match) ---
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+def data_version_etag(conn, *tables: str) -> str:
+    """
+    Weak ETag describing the current contents of the given tables,
+    computed without building the response. Weak because GZipMiddleware may re-encode the body.
+    """
+    version_queries = {
+        "excel_documents": "SELECT COUNT(*), MAX(upload_date) FROM excel_documents",
+        # Id AUTOINCREMENT tidak pernah dipakai ulang: id terkecil/terbesar berubah saat chat ditambah,
+        # diarsipkan atau dihapus. Subquery terpisah agar SQLite memakai lookup rowid, bukan scan tabel.
+        "chat_history": "SELECT (SELECT MIN(id) FROM chat_history), (SELECT MAX(id) FROM chat_history)",
+    }
+    parts = [tuple(conn.execute(version_queries[table]).fetchone()) for table in tables]
+    digest = hashlib.sha1(repr((tables, parts)).encode("utf-8")).hexdigest()[:16]
+    return f'W/"{digest}"'
+
+def not_modified_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Return a bodyless 304 if the client already has this version; otherwise tag `response`."""
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return None
+
 # --- API ENDPOINTS ---
 
 @app.get("/health", response_model=SystemHealth, tags=["System"])
@@ -330,7 +1082,7 @@ def health_check():
 
 # Endpoint for uploading structured documents (Excel/CSV)
 @app.post("/upload-structured-data", response_model=StructuredDocument, tags=["Structured Data"])
-async def upload_structured_document(file: UploadFile = File(...)):
+def upload_structured_document(file: UploadFile = File(...)):
     """Upload structured data documents for processing (XLSX, XLS, CSV)"""
 
     file_extension = Path(file.filename).suffix.lower()
@@ -344,30 +1096,27 @@ async def upload_structured_document(file: UploadFile = File(...)):
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
 
-        _, row_count = extract_data_from_structured_file(file_path)
-
         conn = get_db_connection()
-        conn.execute(
-            "INSERT INTO excel_documents (id, filename, file_path, upload_date, row_count) VALUES (?, ?, ?, ?, ?)",
-            (doc_id, file.filename, str(file_path), datetime.now().isoformat(), row_count)
-        )
-        conn.commit()
-        conn.close()
-
-        df_preview = None
-        if file_extension in ['.xlsx', '.xls']:
-            df_preview = pd.read_excel(file_path)
-        elif file_extension == '.csv':
-            df_preview = pd.read_csv(file_path)
-
-        data_preview = df_preview.head(5).to_dict(orient='records') if df_preview is not None else []
+        try:
+            sheets, first_preview = catalog_structured_document(doc_id, file_path, conn)
+            row_count = sum(sheet.row_count for sheet in sheets)
+            conn.execute(
+                "INSERT INTO excel_documents (id, filename, file_path, upload_date, row_count) VALUES (?, ?, ?, ?, ?)",
+                (doc_id, file.filename, str(file_path), datetime.now().isoformat(), row_count)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        data_preview = first_preview.to_dict(orient='records') if first_preview is not None else []
 
         return StructuredDocument(
             id=doc_id,
             filename=file.filename,
             upload_date=datetime.now().isoformat(),
             data_preview=data_preview,
-            row_count=row_count
+            row_count=row_count,
+            sheets=sheets
         )
     except Exception as e:
         if file_path.exists():
@@ -376,12 +1125,16 @@ async def upload_structured_document(file: UploadFile = File(...)):
 
 
 @app.post("/chat", response_model=ChatResponse, tags=["Chat"])
-async def chat(
+def chat(
     message: ChatMessage
 ):
     """Chat with structured data using GROQ AI, with turn-based logic"""
 
     global conversation_context 
+    # /chat berjalan di threadpool: salin konteks di bawah lock, olah salinan lokal (termasuk menunggu Groq),
+    # lalu tulis kembali di bawah lock, agar chat bersamaan tidak mengubah konteks di tengah giliran lain
+    with conversation_context_lock:
+        context = dict(conversation_context)
     conn = get_db_connection()
 
     ai_response = ""
@@ -391,39 +1144,42 @@ async def chat(
     user_message_lower = message.message.lower()
 
     print(f"\n[DEBUG] Pesan Pengguna: {message.message}")
-    print(f"[DEBUG] Status Konteks Awal: {conversation_context.get('state', 'none')}")
+    print(f"[DEBUG] Status Konteks Awal: {context.get('state', 'none')}")
     print(f"[DEBUG] Jumlah Entri ARCHIVE_DATA: {len(ARCHIVE_DATA)}")
 
 
     # --- Step 1: Check for numerical deep dive selection ---
     try:
         user_choice = int(user_message_lower.strip())
-        if 'state' in conversation_context and conversation_context['state'] == 'awaiting_selection':
-            last_results = conversation_context.get('last_search_results', [])
+        if 'state' in context and context['state'] == 'awaiting_selection':
+            last_results = context.get('last_search_results', [])
             if 1 <= user_choice <= len(last_results):
                 selected_item = last_results[user_choice - 1]
-                conversation_context['selected_item'] = selected_item
-                conversation_context['state'] = 'deep_diving'
+                context['selected_item'] = selected_item
+                context['state'] = 'deep_diving'
                 
                 print(f"[DEBUG] Intent: Deep Dive (pilihan nomor {user_choice})")
 
                 # --- Logika Deep Dive ---
-                prompt_for_deep_dive = f"""
-                Pengguna telah memilih arsip berjudul: "{selected_item}".
-                Sebagai asisten cerdas yang fokus pada arsip, jelaskan lebih detail tentang arsip ini. 
-                Sertakan konteks umum mengenai jenis arsip seperti ini (misalnya, jika 'Inventaris Arsip', jelaskan apa itu inventaris arsip dan apa yang mungkin terkandung di dalamnya). 
-                Jelaskan dengan jelas dan informatif.
-                """
-                ai_response = query_groq(prompt_for_deep_dive, max_tokens=1000)
+                # Pakai ringkasan yang sudah dihitung; panggil Groq hanya jika belum ada
+                ai_response = get_archive_summary(selected_item)
+                if ai_response is None:
+                    prompt_for_deep_dive = build_deep_dive_prompt(selected_item)
+                    ai_response = query_groq(prompt_for_deep_dive, max_tokens=1000)
+                    if not ai_response.startswith("Error:"):
+                        try:
+                            store_archive_summaries([(selected_item, ai_response)])
+                        except sqlite3.Error as e:
+                            print(f"Error saving archive summary: {e}")
                 ai_response += "\n\nApakah ada hal lain yang ingin Anda tanyakan terkait ini, atau ingin mencari arsip lain?"
                 next_action_type = "continue_chat" 
                 source_doc_name = "Daftar Khasanah Arsip (Data_Full_Name.csv)"
             else:
                 ai_response = "Pilihan nomor tidak valid. Silakan pilih nomor dari daftar hasil sebelumnya, atau ketikkan pencarian baru."
                 next_action_type = "await_selection" 
-                if 'last_search_results' in conversation_context and conversation_context['last_search_results']:
+                if 'last_search_results' in context and context['last_search_results']:
                     response_text = "Berikut adalah hasil pencarian yang relevan:\n"
-                    for i, entry in enumerate(conversation_context['last_search_results']):
+                    for i, entry in enumerate(context['last_search_results']):
                         response_text += f"{i+1}. {entry}\n"
                     response_text += "\n\nUntuk informasi lebih detail mengenai salah satu hasil di atas, silakan sebutkan nomornya (misal: '1')."
                     ai_response = response_text
@@ -437,8 +1193,8 @@ async def chat(
             raise ValueError("Not a valid selection for current state.") # Paksa ke blok except
     except ValueError: # Pesan pengguna bukan angka, atau angka tidak valid untuk deep dive
         # Reset state jika pengguna memulai query baru (bukan deep dive)
-        if conversation_context.get('state') not in ['awaiting_selection', 'deep_diving']:
-            conversation_context = {'state': 'initial_search'}
+        if context.get('state') not in ['awaiting_selection', 'deep_diving']:
+            context = {'state': 'initial_search'}
 
         # --- Step 2: Intent Classification (using Groq) ---
         # Ini adalah bagian kunci untuk membedakan antara 'minta contoh umum' vs 'cari spesifik'
@@ -472,28 +1228,31 @@ async def chat(
                 ai_response = response_text
                 source_doc_name = "Daftar Khasanah Arsip (Data_Full_Name.csv)"
                 next_action_type = "await_selection" 
-                conversation_context['last_search_results'] = displayed_results
-                conversation_context['state'] = 'awaiting_selection'
+                context['last_search_results'] = displayed_results
+                context['state'] = 'awaiting_selection'
             else:
                 ai_response = "Maaf, daftar arsip saat ini kosong atau tidak dapat dimuat. Saya tidak bisa memberikan contoh."
                 next_action_type = "continue_chat"
-                conversation_context = {'state': 'general_chat'}
+                context = {'state': 'general_chat'}
         
         elif "INTENT_SEARCH_SPECIFIC_KEYWORD" in intent_response:
             print("[DEBUG] Intent: SEARCH_SPECIFIC_KEYWORD")
             # --- Step 3: Initial Keyword Search in Data_Full_Name.csv ---
-            search_results = search_initial_archive_list(message.message)
+            display_limit = 10
+            displayed_results = search_initial_archive_list(message.message, limit=display_limit)
 
-            if search_results:
-                display_limit = 10
-                displayed_results = search_results[:display_limit]
+            if displayed_results:
+                # Hitung total hanya jika hasil melebihi batas tampilan (tanpa decode semua entri)
+                total_results = len(displayed_results)
+                if total_results == display_limit:
+                    total_results = ARCHIVE_DATA.count_matches(message.message)
 
                 response_text = "Berikut adalah hasil pencarian yang relevan dari daftar arsip:\n"
                 for i, entry in enumerate(displayed_results):
                     response_text += f"{i+1}. {entry}\n"
                 
-                if len(search_results) > display_limit:
-                    response_text += f"\nAda {len(search_results) - display_limit} hasil lainnya. Silakan perjelas pencarian Anda atau sebutkan nomor untuk detail lebih lanjut."
+                if total_results > display_limit:
+                    response_text += f"\nAda {total_results - display_limit} hasil lainnya. Silakan perjelas pencarian Anda atau sebutkan nomor untuk detail lebih lanjut."
 
                 response_text += "\n\nUntuk informasi lebih detail mengenai salah satu hasil di atas, silakan sebutkan nomornya (misal: '1')."
                 
@@ -502,8 +1261,8 @@ async def chat(
                 next_action_type = "await_selection" 
                 
                 # Simpan hasil pencarian untuk konteks 'deep dive'
-                conversation_context['last_search_results'] = displayed_results
-                conversation_context['state'] = 'awaiting_selection'
+                context['last_search_results'] = displayed_results
+                context['state'] = 'awaiting_selection'
 
             else:
                 # Jika tidak ada hasil dari Data_Full_Name.csv untuk kata kunci spesifik
@@ -515,7 +1274,7 @@ async def chat(
                 """
                 ai_response = query_groq(general_prompt, max_tokens=500)
                 next_action_type = "continue_chat"
-                conversation_context = {'state': 'general_chat'}
+                context = {'state': 'general_chat'}
         
         else: # INTENT_OTHER or Groq failed to classify
             print("[DEBUG] Intent: OTHER / Tidak terklasifikasi")
@@ -527,8 +1286,10 @@ async def chat(
             """
             ai_response = query_groq(general_prompt, max_tokens=500)
             next_action_type = "continue_chat"
-            conversation_context = {'state': 'general_chat'}
+            context = {'state': 'general_chat'}
 
+    with conversation_context_lock:
+        conversation_context = context
 
     # Catat histori chat ke database
     try:
@@ -549,11 +1310,43 @@ async def chat(
         "next_action": next_action_type
     }
 
+@app.post("/chat/batch", tags=["Chat"])
+async def chat_batch(
+    file: UploadFile = File(...),
+    previous_results: Optional[UploadFile] = File(None),
+    parallelism: int = BATCH_DEFAULT_PARALLELISM
+):
+    """
+    Answer a JSONL file of questions concurrently and stream the results back as JSONL.
+    Each line: {"id": "...", "message": "..."} or {"id": "...", "archive_title": "..."}.
+    To resume an interrupted run, upload the partial output as `previous_results`.
+    """
+    try:
+        items = parse_batch_lines((await file.read()).splitlines())
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"File batch tidak valid: {e}")
+
+    skip_ids = set()
+    if previous_results is not None:
+        skip_ids = completed_batch_ids((await previous_results.read()).splitlines())
+
+    def result_lines():
+        for result in run_chat_batch(items, parallelism=parallelism, skip_ids=skip_ids):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    # Content-Encoding identity: GZipMiddleware akan menahan baris hasil sampai buffer penuh
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson",
+                             headers={"Content-Encoding": "identity"})
+
 # Endpoint to get list of all structured data documents (Excel/CSV) - Unchanged
 @app.get("/structured-documents", response_model=List[StructuredDocument], tags=["Structured Data"])
-def get_structured_documents():
-    """Get list of all structured data documents (Excel/CSV)"""
+def get_structured_documents(request: Request, response: Response):
+    """Get list of all structured data documents (Excel/CSV); supports If-None-Match"""
     conn = get_db_connection()
+    not_modified = not_modified_response(request, response, data_version_etag(conn, "excel_documents"))
+    if not_modified is not None:
+        conn.close()
+        return not_modified
     documents = conn.execute(
         "SELECT id, filename, upload_date, row_count FROM excel_documents ORDER BY upload_date DESC"
     ).fetchall()
@@ -569,11 +1362,43 @@ def get_structured_documents():
         ))
     return result
 
+@app.get("/structured-documents/{doc_id}/sheets", response_model=List[StructuredSheet], tags=["Structured Data"])
+def get_structured_document_sheets(doc_id: str):
+    """Get the sheet catalog (schema, row count, column dtypes) of a structured data document"""
+    conn = get_db_connection()
+    try:
+        doc = conn.execute("SELECT file_path FROM excel_documents WHERE id = ?", (doc_id,)).fetchone()
+        if not doc:
+            raise HTTPException(status_code=404, detail="Dokumen data terstruktur tidak ditemukan.")
+        sheets = get_structured_sheets(doc_id, conn)
+        if not sheets:
+            sheets, _ = catalog_structured_document(doc_id, Path(doc["file_path"]), conn)
+            conn.commit()
+        return sheets
+    finally:
+        conn.close()
+
+@app.get("/structured-documents/{doc_id}/search", tags=["Structured Data"])
+def search_structured_document(doc_id: str, q: str, sheet_name: Optional[str] = None):
+    """Search a structured data document; with sheet_name only that sheet is loaded"""
+    conn = get_db_connection()
+    try:
+        if not conn.execute("SELECT 1 FROM excel_documents WHERE id = ?", (doc_id,)).fetchone():
+            raise HTTPException(status_code=404, detail="Dokumen data terstruktur tidak ditemukan.")
+    finally:
+        conn.close()
+    response_text, results = search_structured_data(doc_id, q, sheet_name=sheet_name)
+    return {"response": response_text, "results": results}
+
 @app.get("/history", tags=["Chat"])
-def get_chat_history():
-    """Get all chat history"""
+def get_chat_history(request: Request, response: Response):
+    """Get all chat history; supports If-None-Match"""
 
     conn = get_db_connection()
+    not_modified = not_modified_response(request, response, data_version_etag(conn, "chat_history"))
+    if not_modified is not None:
+        conn.close()
+        return not_modified
     history = conn.execute(
         "SELECT message, response, timestamp, is_predefined, excel_document_id, chat_turn FROM chat_history ORDER BY timestamp DESC LIMIT 100"
     ).fetchall()
@@ -586,6 +1411,40 @@ def get_chat_history():
 
     return {"history": parsed_history}
 
+@app.get("/history/search", tags=["Chat"])
+def search_chat_history(q: str, limit: int = 20, include_archived: bool = False):
+    """Full-text search over chat history messages and responses (optionally including archived months)"""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Parameter 'q' tidak boleh kosong.")
+    limit = max(1, min(limit, 100))
+
+    conn = get_db_connection()
+    try:
+        results = _search_chat_history_db(conn, q, limit, CHAT_HISTORY_FTS_AVAILABLE)
+    except sqlite3.OperationalError as e:
+        raise HTTPException(status_code=400, detail=f"Query pencarian tidak valid: {e}")
+    finally:
+        conn.close()
+    for item in results:
+        item["archived_month"] = None
+
+    if include_archived:
+        for month in _chat_archive_months():
+            if len(results) >= limit:
+                break
+            archive_conn = sqlite3.connect(_chat_archive_path(month))
+            archive_conn.row_factory = sqlite3.Row
+            try:
+                for item in _search_chat_history_db(archive_conn, q, limit - len(results), CHAT_HISTORY_FTS_AVAILABLE):
+                    item["archived_month"] = month
+                    results.append(item)
+            except sqlite3.OperationalError as e:
+                print(f"Error searching chat archive {month}: {e}")
+            finally:
+                archive_conn.close()
+
+    return {"query": q, "results": results}
+
 @app.get("/api-info", tags=["System"])
 def get_api_info():
     """Get information about the AI API being used"""
@@ -609,9 +1468,13 @@ def get_api_info():
     }
 
 @app.get("/system-stats", response_model=SystemStats, tags=["System"])
-def get_system_stats():
-    """Get system statistics"""
+def get_system_stats(request: Request, response: Response):
+    """Get system statistics; supports If-None-Match"""
     conn = get_db_connection()
+    not_modified = not_modified_response(request, response, data_version_etag(conn, "excel_documents", "chat_history"))
+    if not_modified is not None:
+        conn.close()
+        return not_modified
 
     total_structured_documents = conn.execute("SELECT COUNT(*) as count FROM excel_documents").fetchone()["count"]
     total_chats = conn.execute("SELECT COUNT(*) as count FROM chat_history").fetchone()["count"]
@@ -671,9 +1534,24 @@ def clear_all_data():
             Path(STRUCTURED_DATA_UPLOAD_DIR).mkdir(exist_ok=True)
 
         conn.execute("DELETE FROM excel_documents")
-        conn.execute("DELETE FROM chat_history")
-
+        conn.execute("DELETE FROM excel_sheets")
+        conn.execute("DELETE FROM excel_sheet_columns")
         conn.commit()
+        clear_structured_sheet_cache()
+
+        # chat_history bisa sangat besar: hapus per batch agar request lain tidak terblokir lama
+        max_id = conn.execute("SELECT MAX(id) FROM chat_history").fetchone()[0]
+        while max_id is not None:
+            deleted = conn.execute(
+                "DELETE FROM chat_history WHERE id IN (SELECT id FROM chat_history WHERE id <= ? LIMIT ?)",
+                (max_id, CHAT_HISTORY_BATCH_SIZE)
+            ).rowcount
+            conn.commit()
+            if deleted == 0:
+                break
+
+        if os.path.exists(CHAT_ARCHIVE_DIR):
+            shutil.rmtree(CHAT_ARCHIVE_DIR)
         conn.close()
 
         return {"message": "Semua dokumen data terstruktur dan riwayat chat berhasil dihapus."}
@@ -683,16 +1561,56 @@ def clear_all_data():
         raise HTTPException(status_code=500, detail=f"Gagal menghapus semua data: {str(e)}")
 
 # --- FRONTEND SERVING ---
+# Hanya file di static_dist yang dilayani; aset ber-fingerprint di-cache selamanya oleh browser
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+def _accepted_encodings(request: Request) -> set:
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(token.strip().lower())
+    return accepted
+
+def serve_static_asset(request: Request, public_name: str, cache_control: str):
+    """Serve a built asset, choosing a precompressed variant and answering 304 on a matching ETag."""
+    entry = STATIC_MANIFEST.get(public_name)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    file_path = Path(STATIC_DIST_DIR) / entry["file"]
+    headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    etag = f'"{entry["hash"]}"'
+    accepted = _accepted_encodings(request)
+    for encoding, suffix in COMPRESSED_VARIANTS.items():
+        variant_path = file_path.with_name(file_path.name + suffix)
+        if encoding in accepted and variant_path.exists():
+            file_path = variant_path
+            headers["Content-Encoding"] = encoding
+            etag = f'"{entry["hash"]}-{encoding}"'
+            break
+    headers["ETag"] = etag
+
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    media_type = mimetypes.guess_type(entry["file"])[0] or "application/octet-stream"
+    return FileResponse(file_path, media_type=media_type, headers=headers)
+
 @app.get("/", response_class=FileResponse, include_in_schema=False)
-async def read_index():
-    return FileResponse("index.html") 
+@app.get("/index.html", response_class=FileResponse, include_in_schema=False)
+async def read_index(request: Request):
+    return serve_static_asset(request, "index.html", REVALIDATE_CACHE_CONTROL)
 
-app.mount("/", StaticFiles(directory=".", html=True), name="static_root") 
+@app.get("/static/{file_name}", include_in_schema=False)
+async def read_static_asset(request: Request, file_name: str):
+    public_names = {entry["file"]: name for name, entry in STATIC_MANIFEST.items() if name != "index.html"}
+    if file_name not in public_names:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return serve_static_asset(request, public_names[file_name], IMMUTABLE_CACHE_CONTROL)
 
 if __name__ == "__main__":
     import uvicorn
-    initialize_db()
-    load_archive_data() 
     print("🚀 Starting Local Structured Data Chat System with GROQ AI (No Authentication)")
     print("📡 API Documentation: http://localhost:8000/docs")
     print("🌐 Frontend Application: http://localhost:8000")
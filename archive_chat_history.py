@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Chat history retention job
+Moves chat_history rows older than N days out of database.db into monthly
+archive databases (chat_archive/chat_history_YYYY-MM.db), keeping the hot
+table small. Archived months stay searchable through
+/history/search?include_archived=true.
+
+Usage:
+    python archive_chat_history.py [--older-than-days 90] [--batch-size 5000]
+"""
+
+import argparse
+import sys
+
+from app import CHAT_ARCHIVE_DIR, CHAT_HISTORY_BATCH_SIZE, archive_chat_history, initialize_db
+
+def main():
+    """Main archival function"""
+    parser = argparse.ArgumentParser(description="Pindahkan riwayat chat lama ke arsip bulanan.")
+    parser.add_argument("--older-than-days", type=int, default=90, help="Arsipkan chat yang lebih lama dari N hari (default: 90)")
+    parser.add_argument("--batch-size", type=int, default=CHAT_HISTORY_BATCH_SIZE, help="Baris per transaksi")
+    args = parser.parse_args()
+
+    initialize_db()
+    moved = archive_chat_history(older_than_days=args.older_than_days, batch_size=args.batch_size)
+    if not moved:
+        print(f"✅ Tidak ada riwayat chat yang lebih lama dari {args.older_than_days} hari.")
+        return 0
+    for month, count in sorted(moved.items()):
+        print(f"   {month}: {count} baris dipindahkan")
+    print(f"✅ {sum(moved.values())} baris riwayat chat diarsipkan ke {CHAT_ARCHIVE_DIR}/")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
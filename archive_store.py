@@ -0,0 +1,158 @@
+"""
+Compact storage for the archive list (Data_Full_Name.csv)
+All entries live in one contiguous UTF-8 buffer addressed by an offsets array,
+instead of one Python str per entry. A lowercased copy is built once for
+searching, so queries no longer lowercase every entry. A store can be saved
+to a file and memory-mapped, which lets several uvicorn workers share the
+same pages.
+
+Memory is only saved on the memory-mapped path. A store built in memory
+with from_entries() holds both buffers and is about 14% larger than the
+equivalent list[str] (1M synthetic entries: 143 MB vs 126 MB).
+"""
+
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import islice
+from typing import Iterable, List, Optional
+
+_MAGIC = b"ARCHSTR1"
+_HEADER = struct.Struct("<8sQQQ")  # magic, jumlah entri, panjang teks, panjang teks lowercase
+_SEPARATOR = b"\x00"  # pemisah entri di buffer lowercase agar hasil find tidak melewati batas entri
+
+
+class ArchiveStore(Sequence):
+    """Read-only sequence of archive entries backed by contiguous buffers."""
+
+    def __init__(self, text_buffer, text_offsets, lower_buffer, lower_offsets,
+                 text_base: int = 0, lower_base: int = 0, mapped_file=None):
+        # Offset relatif terhadap *_base, sehingga buffer bisa berupa seluruh file mmap
+        self._text = text_buffer
+        self._text_offsets = text_offsets
+        self._text_base = text_base
+        self._lower = lower_buffer
+        self._lower_offsets = lower_offsets
+        self._lower_base = lower_base
+        self._mapped_file = mapped_file
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[str]) -> "ArchiveStore":
+        """Build an in-memory store; use save() + open_mmap() to keep it out of process memory."""
+        # bytearray dipakai langsung sebagai buffer, tanpa daftar potongan sementara
+        text = bytearray()
+        lower = bytearray()
+        text_offsets = array("q", [0])
+        lower_offsets = array("q", [0])
+        for entry in entries:
+            text += entry.encode("utf-8")
+            lower += entry.lower().encode("utf-8")
+            lower += _SEPARATOR
+            text_offsets.append(len(text))
+            lower_offsets.append(len(lower))
+        return cls(text, text_offsets, lower, lower_offsets)
+
+    @classmethod
+    def open_mmap(cls, path) -> "ArchiveStore":
+        """Open a store written by save() without copying it into process memory."""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < _HEADER.size:
+            mapped.close()
+            raise ValueError(f"{path} terpotong atau rusak.")
+        magic, count, text_len, lower_len = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC:
+            mapped.close()
+            raise ValueError(f"{path} bukan file archive store yang valid.")
+
+        offsets_size = (count + 1) * 8
+        text_start = _HEADER.size + 2 * offsets_size
+        lower_start = text_start + text_len
+        if lower_start + lower_len > len(mapped):
+            # Periksa ukuran sebelum membuat memoryview, agar map bisa langsung ditutup
+            mapped.close()
+            raise ValueError(f"{path} terpotong atau rusak.")
+
+        view = memoryview(mapped)
+        position = _HEADER.size
+        text_offsets = view[position:position + offsets_size].cast("q")
+        position += offsets_size
+        lower_offsets = view[position:position + offsets_size].cast("q")
+        view.release()
+
+        return cls(mapped, text_offsets, mapped, lower_offsets,
+                   text_base=text_start, lower_base=lower_start, mapped_file=mapped)
+
+    def save(self, path):
+        """Write the store to `path` in the format read by open_mmap()."""
+        count = len(self)
+        text = self._text[self._text_base:self._text_base + self._text_offsets[count]]
+        lower = self._lower[self._lower_base:self._lower_base + self._lower_offsets[count]]
+        # Tulis ke file sementara lalu rename, agar worker lain yang sedang mmap file lama tidak rusak
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, count, len(text), len(lower)))
+                f.write(array("q", self._text_offsets).tobytes())
+                f.write(array("q", self._lower_offsets).tobytes())
+                f.write(text)
+                f.write(lower)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def close(self):
+        if self._mapped_file is not None:
+            self._text_offsets.release()
+            self._lower_offsets.release()
+            self._mapped_file.close()
+            self._mapped_file = None
+
+    def __len__(self) -> int:
+        return len(self._text_offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("archive index out of range")
+        start = self._text_base + self._text_offsets[index]
+        end = self._text_base + self._text_offsets[index + 1]
+        return self._text[start:end].decode("utf-8")
+
+    def _match_positions(self, query: str):
+        """Yield the position of the first match of `query` in each matching entry."""
+        needle = query.lower().encode("utf-8")
+        if not needle:
+            yield from (self._lower_base + self._lower_offsets[i] for i in range(len(self)))
+            return
+        if _SEPARATOR in needle:
+            return
+        lower = self._lower
+        end = self._lower_base + self._lower_offsets[len(self)]
+        position = lower.find(needle, self._lower_base, end)
+        while position != -1:
+            yield position
+            # Lanjut dari entri berikutnya agar satu entri hanya muncul sekali
+            next_entry = lower.find(_SEPARATOR, position + len(needle), end) + 1
+            position = lower.find(needle, next_entry, end)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Return entries containing `query` (case-insensitive), in archive order."""
+        results = []
+        for position in islice(self._match_positions(query), limit):
+            index = bisect_right(self._lower_offsets, position - self._lower_base) - 1
+            results.append(self[index])
+        return results
+
+    def count_matches(self, query: str) -> int:
+        """Number of entries containing `query`, without decoding them."""
+        return sum(1 for _ in self._match_positions(query))
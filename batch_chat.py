@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Batch question answering for the Local Structured Data Chat System
+Reads a JSONL file of questions, answers them concurrently via Groq and
+appends the results as JSONL. Re-running with the same output file resumes
+an interrupted run: items that already succeeded are skipped, and the file is
+first compacted to one successful line per id so failed attempts of retried
+items do not pile up.
+
+Usage:
+    python batch_chat.py questions.jsonl -o results.jsonl -p 4
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from app import (
+    BATCH_DEFAULT_PARALLELISM,
+    completed_batch_ids,
+    load_archive_data,
+    parse_batch_lines,
+    run_chat_batch,
+)
+
+def compact_results(output_path: Path) -> set:
+    """Rewrite the output file with one successful line per id; returns those ids."""
+    kept = {}
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            for item_id in completed_batch_ids([line]):
+                kept.setdefault(item_id, line.rstrip("\n") + "\n")
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(kept.values())
+    os.replace(tmp_path, output_path)
+    return set(kept)
+
+def main():
+    """Main batch function"""
+    parser = argparse.ArgumentParser(description="Jawab pertanyaan arsip secara batch dari file JSONL.")
+    parser.add_argument("input", help="File JSONL berisi pertanyaan ({'id', 'message'} atau {'id', 'archive_title'})")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="File JSONL hasil (default: batch_results.jsonl)")
+    parser.add_argument("-p", "--parallelism", type=int, default=BATCH_DEFAULT_PARALLELISM, help="Jumlah pertanyaan yang diproses bersamaan")
+    parser.add_argument("--archive-csv", default="Data_Full_Name.csv", help="File daftar arsip untuk konteks pencarian")
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        try:
+            items = parse_batch_lines(f)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            return 1
+
+    output_path = Path(args.output)
+    skip_ids = set()
+    if output_path.exists():
+        skip_ids = compact_results(output_path)
+        print(f"[INFO] Melanjutkan run sebelumnya: {len(skip_ids)} item sudah selesai.")
+
+    load_archive_data(args.archive_csv)
+
+    total = sum(1 for item in items if item["id"] not in skip_ids)
+    done = 0
+    failed = 0
+    with open(output_path, "a", encoding="utf-8") as out:
+        for result in run_chat_batch(items, parallelism=args.parallelism, skip_ids=skip_ids):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            done += 1
+            if result["status"] != "ok":
+                failed += 1
+            print(f"[{done}/{total}] {result['id']}: {result['status']}")
+
+    print(f"✅ Batch selesai: {done - failed} berhasil, {failed} gagal. Hasil di {output_path}")
+    return 0 if failed == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
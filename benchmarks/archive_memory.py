@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the archive list representation
+Compares the RSS of ARCHIVE_DATA as a list of str (the old representation)
+with ArchiveStore in memory and ArchiveStore memory-mapped from a file,
+using a synthetic archive. Each variant runs in its own subprocess so the
+numbers do not influence each other.
+
+Usage:
+    python benchmarks/archive_memory.py [--entries 1000000] [--queries 20]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from archive_store import ArchiveStore
+from fixtures import ARCHIVE_QUERIES as QUERIES, synthetic_entries
+
+
+def current_rss_kb(field: str = "VmRSS") -> int:
+    """Read RSS from /proc; RssAnon is the private part that is not shared between workers."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    return 0
+
+
+def run_variant(variant: str, entries: int, queries: int, store_path: str) -> dict:
+    rss_before = current_rss_kb()
+    anon_before = current_rss_kb("RssAnon")
+    start = time.perf_counter()
+    if variant == "list":
+        data = list(synthetic_entries(entries))
+        search = lambda q: [e for e in data if q.lower() in e.lower()]
+    elif variant == "store":
+        data = ArchiveStore.from_entries(synthetic_entries(entries))
+        search = data.search
+    else:
+        data = ArchiveStore.open_mmap(store_path)
+        search = data.search
+    load_seconds = time.perf_counter() - start
+    rss_loaded = current_rss_kb()
+
+    start = time.perf_counter()
+    for i in range(queries):
+        search(QUERIES[i % len(QUERIES)])
+    search_seconds = time.perf_counter() - start
+
+    return {
+        "variant": variant,
+        "entries": len(data),
+        "rss_before_kb": rss_before,
+        "rss_after_load_kb": rss_loaded,
+        "rss_after_search_kb": current_rss_kb(),
+        "private_after_search_kb": current_rss_kb("RssAnon") - anon_before,
+        "load_seconds": round(load_seconds, 3),
+        "avg_search_ms": round(search_seconds / max(queries, 1) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan RSS list[str] vs ArchiveStore.")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--variant", choices=["list", "store", "mmap"], help=argparse.SUPPRESS)
+    parser.add_argument("--store-path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.entries, args.queries, args.store_path)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store_path = os.path.join(tmp, "archive_store.bin")
+        ArchiveStore.from_entries(synthetic_entries(args.entries)).save(store_path)
+
+        results = []
+        for variant in ("list", "store", "mmap"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--variant", variant, "--entries", str(args.entries),
+                 "--queries", str(args.queries), "--store-path", store_path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results.append(json.loads(output))
+
+    print(f"{'variant':<8} {'entries':>9} {'RSS load (MB)':>14} {'RSS search (MB)':>16} {'private (MB)':>13} "
+          f"{'load (s)':>9} {'search (ms)':>12}")
+    for r in results:
+        loaded_mb = (r["rss_after_load_kb"] - r["rss_before_kb"]) / 1024
+        search_mb = (r["rss_after_search_kb"] - r["rss_before_kb"]) / 1024
+        print(f"{r['variant']:<8} {r['entries']:>9} {loaded_mb:>14.1f} {search_mb:>16.1f} "
+              f"{r['private_after_search_kb'] / 1024:>13.1f} "
+              f"{r['load_seconds']:>9} {r['avg_search_ms']:>12}")
+
+
+if __name__ == "__main__":
+    main()
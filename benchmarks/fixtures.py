@@ -0,0 +1,84 @@
+"""
+Synthetic fixtures for the benchmarks
+Builds Data_Full_Name.csv and Excel workbooks at several scales and prepares
+a throwaway working directory in which app.py can be started, so benchmark
+runs never touch the repository's database.db or excel_uploads/.
+"""
+
+import csv
+import os
+import random
+import shutil
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILES = ["app.py", "archive_store.py", "static_assets.py"]
+
+WORDS = [
+    "Inventaris", "Arsip", "Dinas", "Kehutanan", "Biro", "Otonomi", "Daerah", "Pabrik", "Gula",
+    "Sekretariat", "Provinsi", "Jawa", "Timur", "Kabupaten", "Pertanian", "Perkebunan", "Residen",
+    "Gubernur", "Kantor", "Pekerjaan", "Umum", "Surat", "Keputusan", "Laporan", "Tahunan",
+]
+ARCHIVE_QUERIES = ["kehutanan", "biro otonomi", "pabrik gula", "laporan tahunan", "residen", "zzz"]
+
+# archive_entries: baris Data_Full_Name.csv; excel_rows x excel_columns per sheet
+SCALES = {
+    "small": {"archive_entries": 1_000, "excel_rows": 1_000, "excel_columns": 8, "excel_sheets": 1},
+    "medium": {"archive_entries": 50_000, "excel_rows": 20_000, "excel_columns": 12, "excel_sheets": 3},
+    "large": {"archive_entries": 500_000, "excel_rows": 100_000, "excel_columns": 20, "excel_sheets": 5},
+}
+
+
+def synthetic_entries(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield f"{' '.join(rng.choices(WORDS, k=rng.randint(4, 9)))} {1900 + i % 120} No. {i}"
+
+
+def write_archive_csv(path: str, entries: int):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        for entry in synthetic_entries(entries):
+            writer.writerow([entry])
+
+
+def write_excel_workbook(path: str, rows: int, columns: int, sheets: int = 1, seed: int = 7):
+    """Workbook with mixed column types (int, float, text, date) on every sheet."""
+    import datetime
+    import openpyxl
+
+    rng = random.Random(seed)
+    workbook = openpyxl.Workbook(write_only=True)
+    for sheet_index in range(sheets):
+        worksheet = workbook.create_sheet(f"Sheet{sheet_index + 1}")
+        worksheet.append([f"kolom_{c}" for c in range(columns)])
+        for row in range(rows):
+            values = []
+            for c in range(columns):
+                kind = c % 4
+                if kind == 0:
+                    values.append(row)
+                elif kind == 1:
+                    values.append(round(rng.random() * 1000, 2))
+                elif kind == 2:
+                    values.append(" ".join(rng.choices(WORDS, k=3)))
+                else:
+                    values.append(datetime.date(1900 + row % 120, 1 + row % 12, 1 + row % 28))
+            worksheet.append(values)
+    workbook.save(path)
+
+
+def prepare_app_workdir(workdir: str, scale: str = "small", with_excel: bool = True, archive_entries: int = None) -> dict:
+    """Copy the app into `workdir` with fixtures for `scale`; returns the fixture paths."""
+    params = dict(SCALES[scale])
+    if archive_entries is not None:
+        params["archive_entries"] = archive_entries
+    for name in APP_FILES:
+        shutil.copy(os.path.join(REPO_DIR, name), workdir)
+    shutil.copytree(os.path.join(REPO_DIR, "frontend"), os.path.join(workdir, "frontend"), dirs_exist_ok=True)
+
+    paths = {"archive_csv": os.path.join(workdir, "Data_Full_Name.csv")}
+    write_archive_csv(paths["archive_csv"], params["archive_entries"])
+    if with_excel:
+        paths["excel"] = os.path.join(workdir, f"fixture_{scale}.xlsx")
+        write_excel_workbook(paths["excel"], params["excel_rows"], params["excel_columns"], params["excel_sheets"])
+    return paths
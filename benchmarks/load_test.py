@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test
+Starts app.py (uvicorn) in a temporary directory with synthetic fixtures and
+a local mock Groq server, then drives a concurrent mix of /chat,
+/upload-structured-data and list requests. Reports p50/p95/p99 latency,
+throughput and server RSS per workload and saves everything as JSON, so a
+run can be compared against an earlier one with --compare.
+
+Usage:
+    python benchmarks/load_test.py --scale medium --requests 500 --concurrency 16 \
+        --latency-ms 300 --rate-limit-ratio 0.05 --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import ARCHIVE_QUERIES, SCALES, prepare_app_workdir
+from mock_groq import MockGroqServer
+
+DEFAULT_MIX = "chat_search=4,chat_deep_dive=2,list_documents=2,history=1,upload=1"
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def process_rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def multipart_body(file_path: str):
+    boundary = uuid.uuid4().hex
+    with open(file_path, "rb") as f:
+        data = f.read()
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{os.path.basename(file_path)}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode("utf-8") + data + f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+class Workloads:
+    """One method per workload; each returns the HTTP status code."""
+
+    def __init__(self, base_url: str, excel_path: str):
+        self.base_url = base_url
+        self.upload_body, self.upload_content_type = multipart_body(excel_path) if excel_path else (None, None)
+
+    def _request(self, method: str, path: str, body: bytes = None, content_type: str = None) -> int:
+        request = urllib.request.Request(f"{self.base_url}{path}", data=body, method=method)
+        if content_type:
+            request.add_header("Content-Type", content_type)
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def _chat(self, message: str) -> int:
+        return self._request("POST", "/chat", json.dumps({"message": message}).encode("utf-8"), "application/json")
+
+    def chat_search(self, rng) -> int:
+        return self._chat(rng.choice(ARCHIVE_QUERIES))
+
+    def chat_deep_dive(self, rng) -> int:
+        return self._chat(str(rng.randint(1, 5)))
+
+    def list_documents(self, rng) -> int:
+        return self._request("GET", "/structured-documents")
+
+    def history(self, rng) -> int:
+        return self._request("GET", "/history")
+
+    def upload(self, rng) -> int:
+        return self._request("POST", "/upload-structured-data", self.upload_body, self.upload_content_type)
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if not hasattr(Workloads, name.strip()):
+            raise SystemExit(f"Workload tidak dikenal: {name}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def wait_until_ready(base_url: str, timeout: float = 120.0):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(f"{base_url}/structured-documents", timeout=1) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.05)
+    raise TimeoutError("Server aplikasi tidak siap")
+
+
+def run_load(workloads: Workloads, weights: dict, total_requests: int, concurrency: int, seed: int):
+    names = list(weights)
+    samples = []
+    samples_lock = threading.Lock()
+    counter = iter(range(total_requests))
+    counter_lock = threading.Lock()
+
+    def worker(worker_id: int):
+        rng = random.Random(seed + worker_id)
+        while True:
+            with counter_lock:
+                if next(counter, None) is None:
+                    return
+            name = rng.choices(names, weights=[weights[n] for n in names])[0]
+            start = time.perf_counter()
+            try:
+                status = getattr(workloads, name)(rng)
+            except Exception:
+                status = 0
+            elapsed = time.perf_counter() - start
+            with samples_lock:
+                samples.append((name, elapsed, status))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples, wall_seconds: float) -> dict:
+    def stats(latencies, errors):
+        latencies = sorted(latencies)
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "throughput_rps": round(len(latencies) / wall_seconds, 2) if wall_seconds else 0.0,
+        }
+
+    summary = {"overall": stats([s[1] for s in samples], sum(1 for s in samples if not 200 <= s[2] < 300))}
+    for name in sorted({s[0] for s in samples}):
+        subset = [s for s in samples if s[0] == name]
+        summary[name] = stats([s[1] for s in subset], sum(1 for s in subset if not 200 <= s[2] < 300))
+    return summary
+
+
+def print_report(results: dict, baseline: dict = None):
+    print(f"{'workload':<16} {'req':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rps':>8}")
+    for name, row in results["latency"].items():
+        line = (f"{name:<16} {row['requests']:>6} {row['errors']:>5} {row['p50_ms']:>9} "
+                f"{row['p95_ms']:>9} {row['p99_ms']:>9} {row['throughput_rps']:>8}")
+        previous = (baseline or {}).get("latency", {}).get(name)
+        if previous and previous["p95_ms"]:
+            line += f"   p95 {100 * (row['p95_ms'] - previous['p95_ms']) / previous['p95_ms']:+.1f}%"
+        print(line)
+    memory = results["memory"]
+    print(f"Server RSS: start {memory['rss_start_mb']} MB, puncak {memory['rss_peak_mb']} MB, akhir {memory['rss_end_mb']} MB")
+    print(f"Mock Groq: {results['mock_groq']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test end-to-end dengan server Groq tiruan.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Bobot workload (default: {DEFAULT_MIX})")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Latensi rata-rata mock Groq")
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Porsi request Groq yang dijawab 429")
+    parser.add_argument("--no-groq-cache", action="store_true", help="Nonaktifkan cache jawaban Groq di aplikasi")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    parser.add_argument("--compare", help="File JSON hasil run sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    mock = MockGroqServer(("127.0.0.1", 0), args.latency_ms, args.jitter_ms, args.rate_limit_ratio, seed=args.seed)
+    mock.start_in_thread()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"📦 Menyiapkan fixture skala '{args.scale}'...")
+        fixtures = prepare_app_workdir(workdir, args.scale, with_excel="upload" in weights)
+
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        env = dict(os.environ, GROQ_API_URL=mock.url, GROQ_API_KEY="benchmark")
+        if args.no_groq_cache:
+            env["GROQ_CACHE_SIZE"] = "0"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_ready(base_url)
+            rss_samples = [process_rss_kb(server.pid)]
+            sampling = threading.Event()
+
+            def sample_rss():
+                while not sampling.wait(0.25):
+                    rss_samples.append(process_rss_kb(server.pid))
+
+            sampler = threading.Thread(target=sample_rss, daemon=True)
+            sampler.start()
+            print(f"🚀 Menjalankan {args.requests} request dengan konkurensi {args.concurrency}...")
+            samples, wall_seconds = run_load(Workloads(base_url, fixtures.get("excel")), weights,
+                                             args.requests, args.concurrency, args.seed)
+            sampling.set()
+            sampler.join()
+            rss_samples.append(process_rss_kb(server.pid))
+        finally:
+            server.terminate()
+            server.wait()
+            mock.shutdown()
+
+    results = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "wall_seconds": round(wall_seconds, 2),
+        "latency": summarize(samples, wall_seconds),
+        "memory": {
+            "rss_start_mb": round(rss_samples[0] / 1024, 1),
+            "rss_peak_mb": round(max(rss_samples) / 1024, 1),
+            "rss_end_mb": round(rss_samples[-1] / 1024, 1),
+        },
+        "mock_groq": dict(mock.stats),
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the search paths
+Times search_initial_archive_list (archive keyword search) and
+search_structured_data (search in an uploaded workbook, with a cold and a
+warm sheet cache) in-process, against synthetic fixtures in a temporary
+directory.
+
+Usage:
+    python benchmarks/microbench.py [--scale medium] [--repeat 20] [--output micro.json] [--compare before.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import ARCHIVE_QUERIES, SCALES, prepare_app_workdir
+
+STRUCTURED_QUERIES = ["kehutanan", "pabrik gula", "zzz"]
+
+
+def time_calls(func, repeat: int, before_each=None) -> dict:
+    durations = []
+    for _ in range(repeat):
+        if before_each:
+            before_each()
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    return {
+        "mean_ms": round(statistics.fmean(durations) * 1000, 3),
+        "p50_ms": round(durations[len(durations) // 2] * 1000, 3),
+        "max_ms": round(durations[-1] * 1000, 3),
+    }
+
+
+def register_workbook(app, excel_path: str) -> str:
+    """Store the fixture the same way /upload-structured-data does and return its id."""
+    doc_id = str(uuid.uuid4())
+    file_path = Path(app.STRUCTURED_DATA_UPLOAD_DIR) / f"{doc_id}{Path(excel_path).suffix}"
+    shutil.copy(excel_path, file_path)
+    conn = app.get_db_connection()
+    sheets, _ = app.catalog_structured_document(doc_id, file_path, conn)
+    conn.execute(
+        "INSERT INTO excel_documents (id, filename, file_path, upload_date, row_count) VALUES (?, ?, ?, ?, ?)",
+        (doc_id, Path(excel_path).name, str(file_path), "benchmark", sum(s.row_count for s in sheets))
+    )
+    conn.commit()
+    conn.close()
+    return doc_id
+
+
+def run(scale: str, repeat: int) -> dict:
+    results = {"config": {"scale": scale, "repeat": repeat, **SCALES[scale]}, "archive_search": {}, "structured_search": {}}
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        fixtures = prepare_app_workdir(workdir, scale)
+        os.chdir(workdir)
+        sys.path.insert(0, workdir)
+        try:
+            import app
+            app.initialize_db()
+            app.load_archive_data(fixtures["archive_csv"])
+
+            for query in ARCHIVE_QUERIES:
+                results["archive_search"][query] = {
+                    "matches": app.ARCHIVE_DATA.count_matches(query),
+                    "all_results": time_calls(lambda: app.search_initial_archive_list(query), repeat),
+                    "first_10": time_calls(lambda: app.search_initial_archive_list(query, limit=10), repeat),
+                }
+
+            doc_id = register_workbook(app, fixtures["excel"])
+            for query in STRUCTURED_QUERIES:
+                results["structured_search"][query] = {
+                    "cold_cache": time_calls(lambda: app.search_structured_data(doc_id, query), max(1, repeat // 4),
+                                             before_each=app.clear_structured_sheet_cache),
+                    "warm_cache": time_calls(lambda: app.search_structured_data(doc_id, query), repeat),
+                }
+        finally:
+            os.chdir(previous_cwd)
+            sys.path.remove(workdir)
+    return results
+
+
+def print_report(results: dict, baseline: dict = None):
+    def delta(section, query, variant, value):
+        try:
+            before = baseline[section][query][variant]["p50_ms"]
+        except (KeyError, TypeError):
+            return ""
+        return f"  ({100 * (value - before) / before:+.1f}%)" if before else ""
+
+    print("search_initial_archive_list (p50 ms)")
+    for query, row in results["archive_search"].items():
+        print(f"  {query:<16} cocok={row['matches']:<8} semua={row['all_results']['p50_ms']}"
+              f"{delta('archive_search', query, 'all_results', row['all_results']['p50_ms'])}"
+              f"  10 pertama={row['first_10']['p50_ms']}"
+              f"{delta('archive_search', query, 'first_10', row['first_10']['p50_ms'])}")
+    print("search_structured_data (p50 ms)")
+    for query, row in results["structured_search"].items():
+        print(f"  {query:<16} cold={row['cold_cache']['p50_ms']}"
+              f"{delta('structured_search', query, 'cold_cache', row['cold_cache']['p50_ms'])}"
+              f"  warm={row['warm_cache']['p50_ms']}"
+              f"{delta('structured_search', query, 'warm_cache', row['warm_cache']['p50_ms'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark fungsi pencarian.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    parser.add_argument("--compare", help="File JSON hasil run sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    results = run(args.scale, args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Mock Groq server for benchmarks
+Implements POST /openai/v1/chat/completions with configurable latency and
+HTTP 429 injection. Intent-classification prompts from /chat get an intent
+label back, all other prompts get filler text. Point the app at it with
+GROQ_API_URL=http://127.0.0.1:<port>/openai/v1/chat/completions.
+
+Usage:
+    python benchmarks/mock_groq.py [--port 8765] [--latency-ms 300] [--jitter-ms 100] [--rate-limit-ratio 0.05]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+INTENT_PROMPT_MARKER = "Tentukan niat pengguna"
+FILLER_SENTENCE = "Arsip ini berisi dokumen administrasi yang disusun berdasarkan asal-usul dan urutan aslinya. "
+
+
+class MockGroqServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms=300.0, jitter_ms=100.0, rate_limit_ratio=0.0,
+                 retry_after="0.1", intent="INTENT_SEARCH_SPECIFIC_KEYWORD", seed=None):
+        super().__init__(address, MockGroqHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.intent = intent
+        self.rng = random.Random(seed)
+        self.stats = {"requests": 0, "rate_limited": 0}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{COMPLETIONS_PATH}"
+
+    def start_in_thread(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+class MockGroqHandler(BaseHTTPRequestHandler):
+    server: MockGroqServer
+
+    def log_message(self, format, *args):
+        pass  # jangan cetak log per request selama benchmark
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "invalid JSON"}})
+            return
+        if self.path != COMPLETIONS_PATH:
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        server = self.server
+        with server.stats_lock:
+            server.stats["requests"] += 1
+            rate_limited = server.rng.random() < server.rate_limit_ratio
+            delay = max(0.0, server.latency_ms + server.rng.uniform(-server.jitter_ms, server.jitter_ms)) / 1000
+            if rate_limited:
+                server.stats["rate_limited"] += 1
+        if rate_limited:
+            self._send_json(429, {"error": {"message": "Rate limit reached"}}, {"Retry-After": server.retry_after})
+            return
+
+        time.sleep(delay)
+        prompt = payload.get("messages", [{}])[-1].get("content", "")
+        if INTENT_PROMPT_MARKER in prompt:
+            content = server.intent
+        else:
+            max_tokens = int(payload.get("max_tokens", 200))
+            content = (FILLER_SENTENCE * max(1, max_tokens // 16)).strip()
+        self._send_json(200, {
+            "id": "mock-completion",
+            "object": "chat.completion",
+            "model": payload.get("model", "mock"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server Groq tiruan untuk benchmark.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Porsi request yang dijawab 429 (0-1)")
+    parser.add_argument("--retry-after", default="0.1", help="Nilai header Retry-After untuk respons 429")
+    args = parser.parse_args()
+
+    server = MockGroqServer((args.host, args.port), args.latency_ms, args.jitter_ms,
+                            args.rate_limit_ratio, args.retry_after)
+    print(f"🧪 Mock Groq berjalan di {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Statistik: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark
+Measures (1) how long `import app` takes and (2) the time from spawning a
+uvicorn worker until the first request is served, both with a cold archive
+snapshot (CSV parsed and snapshot written) and a warm one (snapshot mapped).
+Runs in a temporary directory with a synthetic Data_Full_Name.csv so the
+repository's database.db is not touched.
+
+Usage:
+    python benchmarks/startup_time.py [--entries 200000] [--runs 5] [--output startup.json]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import prepare_app_workdir
+
+IMPORT_SNIPPET = (
+    "import sys, time, json; t = time.perf_counter(); import app; "
+    "print(json.dumps({'seconds': time.perf_counter() - t, 'pandas_loaded': 'pandas' in sys.modules}))"
+)
+
+
+def clear_snapshot(workdir: str):
+    for name in ("archive_snapshot.bin", "archive_snapshot.bin.json"):
+        path = os.path.join(workdir, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure_import(workdir: str) -> dict:
+    output = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=workdir,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure_first_request(workdir: str, timeout: float = 60.0) -> float:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/structured-documents"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.01)
+        raise TimeoutError(f"Server tidak merespons dalam {timeout} detik")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def summarize(values) -> dict:
+    return {"median": round(statistics.median(values), 4), "min": round(min(values), 4), "max": round(max(values), 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ukur waktu import dan waktu hingga request pertama dilayani.")
+    parser.add_argument("--entries", type=int, default=200_000, help="Jumlah entri Data_Full_Name.csv sintetis")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        prepare_app_workdir(workdir, with_excel=False, archive_entries=args.entries)
+
+        imports = [measure_import(workdir) for _ in range(args.runs)]
+        cold, warm = [], []
+        for _ in range(args.runs):
+            clear_snapshot(workdir)
+            cold.append(measure_first_request(workdir))
+            warm.append(measure_first_request(workdir))
+
+    results = {
+        "entries": args.entries,
+        "runs": args.runs,
+        "import_seconds": summarize([r["seconds"] for r in imports]),
+        "pandas_loaded_on_import": any(r["pandas_loaded"] for r in imports),
+        "first_request_cold_snapshot_seconds": summarize(cold),
+        "first_request_warm_snapshot_seconds": summarize(warm),
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 // Local Structured Data Chat System - Main JavaScript
-// Version: 3.4.1 (Fixed GET /structured-documents loop during chat interaction)
+// Version: 3.5.0 (Cached GET requests with ETag revalidation and in-flight deduplication)
 
 // --- GLOBAL STATE & CONFIGURATION ---
 const API_BASE_URL = 'http://localhost:8000';
@@ -147,7 +147,8 @@ function renderEmptyState(containerElement, message) {
 }
 
 // --- API FUNCTIONS ---
-async function apiCall(endpoint, options = {}) {
+// Shared fetch + error handling; returns the raw Response (2xx, or 304 for conditional GETs).
+async function apiFetch(endpoint, options = {}) {
     const url = `${API_BASE_URL}${endpoint}`;
     const config = {
         ...options,
@@ -159,7 +160,7 @@ async function apiCall(endpoint, options = {}) {
 
     try {
         const response = await fetch(url, config);
-        if (!response.ok) {
+        if (!response.ok && response.status !== 304) {
             let errorData;
             try {
                 errorData = await response.json();
@@ -168,16 +169,64 @@ async function apiCall(endpoint, options = {}) {
             }
             throw new Error(errorData.detail || `HTTP error ${response.status}`);
         }
-        if (response.status === 204 || response.headers.get("content-length") === "0") {
-            return null;
-        }
-        return await response.json();
+        return response;
     } catch (error) {
         console.error('API Call Error:', error.message, `Endpoint: ${endpoint}`);
         throw new Error(error.message || 'Gagal terhubung ke server. Periksa koneksi Anda.');
     }
 }
 
+async function apiCall(endpoint, options = {}) {
+    const response = await apiFetch(endpoint, options);
+    if (response.status === 204 || response.headers.get("content-length") === "0") {
+        return null;
+    }
+    return await response.json();
+}
+
+// --- CLIENT DATA LAYER (cached GET) ---
+// Cached GET responses per endpoint: { etag, data }. Every call still revalidates with
+// If-None-Match; the server answers 304 (no body) when nothing changed.
+const apiResponseCache = new Map();
+// Identical GET requests that are still running share one fetch.
+const inFlightGetRequests = new Map();
+
+async function cachedApiGet(endpoint) {
+    if (inFlightGetRequests.has(endpoint)) {
+        return inFlightGetRequests.get(endpoint);
+    }
+
+    const request = (async () => {
+        const cached = apiResponseCache.get(endpoint);
+        const response = await apiFetch(endpoint, {
+            headers: cached ? { 'If-None-Match': cached.etag } : {},
+        });
+        if (response.status === 304 && cached) {
+            return cached.data;
+        }
+
+        const data = await response.json();
+        const etag = response.headers.get('ETag');
+        if (etag) {
+            apiResponseCache.set(endpoint, { etag, data });
+        } else {
+            apiResponseCache.delete(endpoint);
+        }
+        return data;
+    })();
+
+    inFlightGetRequests.set(endpoint, request);
+    try {
+        return await request;
+    } finally {
+        inFlightGetRequests.delete(endpoint);
+    }
+}
+
+function clearApiResponseCache() {
+    apiResponseCache.clear();
+}
+
 // --- GENERAL APP STATE & UI FUNCTIONS ---
 function resetAppState() {
     selectedChatStructuredDocumentId = null;
@@ -343,7 +392,7 @@ async function performUploadStructuredDocument() {
 
 async function loadAllStructuredDocuments() {
     try {
-        const data = await apiCall('/structured-documents');
+        const data = await cachedApiGet('/structured-documents');
         renderStructuredDocumentList(data || [], elements.structuredDocumentsContainer);
     } catch (error) {
         showAlert(`Gagal memuat dokumen data terstruktur: ${error.message}`, 'error');
@@ -390,7 +439,7 @@ function renderStructuredDocumentList(documents, containerElement = elements.str
 async function loadStructuredDocumentsForChat() {
     console.log("Loading structured documents for chat sidebar..."); // Debug log
     try {
-        const structuredData = await apiCall('/structured-documents');
+        const structuredData = await cachedApiGet('/structured-documents');
         renderChatDocumentSelectionList(structuredData || [], elements.chatStructuredDocumentList, 'structured');
 
         // Check if a document was previously selected for chat and re-activate it
@@ -608,7 +657,7 @@ function renderChatMessageHistoryUI() {
 
 async function loadAllChatHistory() {
     try {
-        const data = await apiCall('/history');
+        const data = await cachedApiGet('/history');
         renderChatHistoryList(data.history || []);
     } catch (error) {
         showAlert(`Gagal memuat riwayat chat: ${error.message}`, 'error');
@@ -659,6 +708,7 @@ async function clearAllData() {
             showLoading();
             try {
                 await apiCall('/clear-all-data', { method: 'DELETE' });
+                clearApiResponseCache();
                 showAlert('Semua data dan riwayat chat berhasil dihapus.', 'success');
                 resetAppState();
                 navigateToSection('uploadStructured');
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Precompute deep-dive summaries for every entry in Data_Full_Name.csv
+Summaries are stored in the archive_summaries table and served by /chat
+without a live Groq call. Re-running only generates summaries for new titles
+and removes summaries for titles that are no longer in the CSV.
+
+Usage:
+    python precompute_summaries.py [--refresh-all] [--keep-stale] [-p 4]
+"""
+
+import argparse
+import sys
+
+import app
+from app import (
+    BATCH_DEFAULT_PARALLELISM,
+    initialize_db,
+    load_archive_data,
+    precompute_archive_summaries,
+)
+
+def main():
+    """Main precompute function"""
+    parser = argparse.ArgumentParser(description="Hitung ringkasan deep dive untuk semua entri arsip.")
+    parser.add_argument("--archive-csv", default="Data_Full_Name.csv", help="File daftar arsip")
+    parser.add_argument("-p", "--parallelism", type=int, default=BATCH_DEFAULT_PARALLELISM, help="Jumlah judul yang diproses bersamaan")
+    parser.add_argument("--refresh-all", action="store_true", help="Buat ulang ringkasan untuk semua judul")
+    parser.add_argument("--keep-stale", action="store_true", help="Jangan hapus ringkasan untuk judul yang sudah tidak ada di CSV")
+    args = parser.parse_args()
+
+    initialize_db()
+    load_archive_data(args.archive_csv)
+
+    if not app.ARCHIVE_DATA:
+        print("[ERROR] Daftar arsip kosong, tidak ada yang diproses.")
+        return 1
+
+    stats = precompute_archive_summaries(
+        parallelism=args.parallelism,
+        refresh_all=args.refresh_all,
+        prune=not args.keep_stale,
+    )
+    print(f"✅ Ringkasan arsip: {stats['generated']} dibuat, {stats['skipped']} sudah ada, "
+          f"{stats['removed']} dihapus, {stats['failed']} gagal (total {stats['total_titles']} judul).")
+    return 0 if stats["failed"] == 0 else 2
+
+if __name__ == "__main__":
+    sys.exit(main())
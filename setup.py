@@ -31,6 +31,29 @@ def create_database():
     ''')
     print("   Ensured 'excel_documents' table (structured data) exists.")
 
+    # Katalog sheet untuk setiap dokumen terstruktur (skema, jumlah baris, tipe kolom)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS excel_sheets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            document_id TEXT NOT NULL,
+            sheet_index INTEGER NOT NULL,
+            sheet_name TEXT NOT NULL,
+            row_count INTEGER NOT NULL,
+            column_count INTEGER NOT NULL,
+            UNIQUE (document_id, sheet_name)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS excel_sheet_columns (
+            sheet_id INTEGER NOT NULL,
+            column_index INTEGER NOT NULL,
+            column_name TEXT NOT NULL,
+            dtype TEXT NOT NULL,
+            PRIMARY KEY (sheet_id, column_index)
+        )
+    ''')
+    print("   Ensured 'excel_sheets' and 'excel_sheet_columns' tables exist.")
+
 
     # Perbarui tabel chat_history: Pastikan kolom yang relevan ada
     cursor.execute("PRAGMA table_info(chat_history)")
@@ -64,6 +87,17 @@ def create_database():
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_chat_history_timestamp ON chat_history(timestamp)')
     print("   Ensured 'chat_history' table is up-to-date with necessary columns.")
 
+    # Tabel ringkasan deep dive arsip (diisi oleh precompute_summaries.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS archive_summaries (
+            title_hash TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            summary TEXT NOT NULL,
+            generated_at TEXT NOT NULL
+        )
+    ''')
+    print("   Ensured 'archive_summaries' table exists.")
+
     conn.commit()
     conn.close()
     print("✅ Database tables created successfully")
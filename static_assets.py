@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Static asset pipeline for the frontend
+Copies frontend/index.html, script.js and styles.css into static_dist/ with
+content-hash fingerprinted filenames (script.<hash>.js), rewrites the
+references in index.html and writes precompressed .gz (and .br when the
+optional `brotli` package is installed) variants next to every file.
+app.py runs the build on startup; it can also be run by hand:
+
+    python static_assets.py
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict
+
+try:
+    import brotli
+except ImportError:  # brotli opsional; tanpa itu hanya varian .gz yang dibuat
+    brotli = None
+
+FRONTEND_DIR = "frontend"
+STATIC_DIST_DIR = "static_dist"
+ENTRY_FILE = "index.html"
+FINGERPRINTED_FILES = ["script.js", "styles.css"]
+COMPRESSED_VARIANTS = {"br": ".br", "gzip": ".gz"}  # urutan = preferensi
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _fingerprinted_name(file_name: str, content_hash: str) -> str:
+    stem, suffix = os.path.splitext(file_name)
+    return f"{stem}.{content_hash}{suffix}"
+
+
+def _write_atomic(path: Path, data: bytes):
+    # Beberapa worker bisa membangun aset bersamaan; rename membuat penulisan atomik
+    tmp_path = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _write_with_variants(path: Path, data: bytes, overwrite: bool = True):
+    variants = {path: data}
+    variants[path.with_name(path.name + COMPRESSED_VARIANTS["gzip"])] = gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        variants[path.with_name(path.name + COMPRESSED_VARIANTS["br"])] = brotli.compress(data)
+    for variant_path, variant_data in variants.items():
+        if overwrite or not variant_path.exists():
+            _write_atomic(variant_path, variant_data)
+    return variants.keys()
+
+
+def build_static_assets(source_dir: str = FRONTEND_DIR, output_dir: str = STATIC_DIST_DIR) -> Dict[str, Dict[str, str]]:
+    """
+    Build static_dist/ and return the manifest: public name -> {"file": built file name, "hash": content hash}.
+    Files left over from previous builds are removed.
+    """
+    source = Path(source_dir)
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    manifest = {}
+    written = set()
+    for file_name in FINGERPRINTED_FILES:
+        data = (source / file_name).read_bytes()
+        content_hash = _content_hash(data)
+        built_name = _fingerprinted_name(file_name, content_hash)
+        # Nama file sudah mengandung hash isi, jadi file yang sudah ada tidak perlu ditulis ulang
+        written.update(_write_with_variants(output / built_name, data, overwrite=False))
+        manifest[file_name] = {"file": built_name, "hash": content_hash}
+
+    index_html = (source / ENTRY_FILE).read_text(encoding="utf-8")
+    for file_name, entry in manifest.items():
+        index_html = re.sub(
+            rf'(\s(?:src|href)=")(?:\./|/)?{re.escape(file_name)}(")',
+            rf'\g<1>/static/{entry["file"]}\g<2>',
+            index_html,
+        )
+    index_data = index_html.encode("utf-8")
+    written.update(_write_with_variants(output / ENTRY_FILE, index_data))
+    manifest[ENTRY_FILE] = {"file": ENTRY_FILE, "hash": _content_hash(index_data)}
+
+    manifest_path = output / "manifest.json"
+    _write_atomic(manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+    written.add(manifest_path)
+
+    for stale_path in output.iterdir():
+        if stale_path.is_file() and stale_path not in written and ".tmp" not in stale_path.name:
+            stale_path.unlink(missing_ok=True)
+
+    return manifest
+
+
+if __name__ == "__main__":
+    for public_name, entry in build_static_assets().items():
+        print(f"✅ {public_name} -> {STATIC_DIST_DIR}/{entry['file']}")
+    if brotli is None:
+        print("ℹ️  Paket 'brotli' tidak terpasang: hanya varian .gz yang dibuat.")